@@ -1,19 +1,36 @@
 """ Initiate the game module """
 
-import pygame
+# nothing is set up on import, so the command line tools under `game` (like
+# `python -m game.analytics`) and the worker processes don't open a window or
+# touch the save file
 
-from .__main__ import main
-from .utils.text import register_font
 
-# friendly wait message
-print("Sit tight, loading the game...", flush=True)
+def init():
+    """initialise pygame and register the fonts, before any view is created"""
+    # pylint: disable=import-outside-toplevel
+    import pygame
 
-# initialise pygame
-pygame.init()
+    from .utils.text import register_font
+
+    # friendly wait message
+    print("Sit tight, loading the game...", flush=True)
+
+    # initialise pygame
+    pygame.init()
+
+    # register the fonts
+    register_font("pokemon-hollow", "assets/Pokemon Hollow.ttf", 23)
+    register_font("pokemon-solid", "assets/Pokemon Solid.ttf", 23)
+
+
+def main():
+    """initiates and runs the game"""
+    init()
+    # the views load the save file when imported
+    from .__main__ import main as run  # pylint: disable=import-outside-toplevel
+
+    run()
 
-# register the fonts
-register_font("pokemon-hollow", "assets/Pokemon Hollow.ttf", 23)
-register_font("pokemon-solid", "assets/Pokemon Solid.ttf", 23)
 
 # export the main function
-__all__ = ["main"]
+__all__ = ["init", "main"]
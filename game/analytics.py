@@ -0,0 +1,172 @@
+""" World analytics over large regions, run with `python -m game.analytics` """
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.config import WORLD_SEED
+from game.world import (
+    BIOMES,
+    TILE_ENEMY,
+    TILE_FLOOR,
+    TILE_WALL,
+    biome_field,
+    generate_block,
+)
+
+# tiles reported, in order
+TILES = {"floor": TILE_FLOOR, "wall": TILE_WALL, "enemy": TILE_ENEMY}
+# the tile the player starts on, the level starts at [0, 0] with the player at (4, 4)
+SPAWN = (-4, -4)
+# characters for the ascii heatmap, from empty to dense
+SHADES = " .:-=+*#%@"
+
+
+def analyse_block(  # pylint: disable=too-many-locals
+    rect: tuple[int, int, int, int],
+    seed: int,
+    cell: int,
+    center: tuple[int, int],
+    radius: float | None,
+) -> tuple[tuple[int, int], NDArray, NDArray, NDArray]:
+    """
+    Count the tiles of one block of the world, runs in a worker process
+
+    :param rect: absolute (x0, y0, x1, y1) of the block, aligned to `cell`
+    :param seed: world seed
+    :param cell: size of a heatmap cell in tiles
+    :param center: center of the radius filter
+    :param radius: only count tiles this close to the center, everything if None
+    :return: the block origin, tile counts, biome counts and the per cell enemy
+        counts indexed [y, x]
+    """
+    x0, y0, x1, y1 = rect
+    tiles = generate_block(seed, x0, y0, x1 - x0, y1 - y0)
+    inside = np.ones(tiles.shape, dtype=bool)
+    if radius is not None:
+        dx = np.arange(x0, x1) - center[0]
+        dy = np.arange(y0, y1)[:, None] - center[1]
+        inside = dx * dx + dy * dy <= radius * radius
+
+    counts = np.array([np.count_nonzero(inside & (tiles == t)) for t in TILES.values()])
+    biomes = np.bincount(
+        biome_field(seed, x0, y0, x1 - x0, y1 - y0)[inside], minlength=len(BIOMES)
+    )
+    enemies = (inside & (tiles == TILE_ENEMY)).reshape(
+        (y1 - y0) // cell, cell, (x1 - x0) // cell, cell
+    )
+    return (x0, y0), counts, biomes, enemies.sum(axis=(1, 3))
+
+
+def split(rect: tuple[int, int, int, int], block: int):
+    """split a rectangle into blocks, the edges may be smaller"""
+    x0, y0, x1, y1 = rect
+    for top in range(y0, y1, block):
+        for left in range(x0, x1, block):
+            yield left, top, min(left + block, x1), min(top + block, y1)
+
+
+def run(args: argparse.Namespace) -> dict:  # pylint: disable=too-many-locals
+    """run the analysis over a process pool and collect the results"""
+
+    if args.radius is not None:
+        r = int(np.ceil(args.radius))
+        rect = (SPAWN[0] - r, SPAWN[1] - r, SPAWN[0] + r + 1, SPAWN[1] + r + 1)
+    else:
+        rect = (args.x0, args.y0, args.x1, args.y1)
+    # align the region to the heatmap cells
+    cell = args.cell
+    rect = (
+        rect[0] // cell * cell,
+        rect[1] // cell * cell,
+        -(-rect[2] // cell) * cell,
+        -(-rect[3] // cell) * cell,
+    )
+    block = max(cell, args.block // cell * cell)
+
+    counts = np.zeros(len(TILES), dtype=np.int64)
+    biomes = np.zeros(len(BIOMES), dtype=np.int64)
+    heatmap = np.zeros(
+        ((rect[3] - rect[1]) // cell, (rect[2] - rect[0]) // cell), dtype=np.int64
+    )
+    work = partial(
+        analyse_block, seed=args.seed, cell=cell, center=SPAWN, radius=args.radius
+    )
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        for (x0, y0), c, b, h in pool.map(work, split(rect, block), chunksize=4):
+            counts += c
+            biomes += b
+            top, left = (y0 - rect[1]) // cell, (x0 - rect[0]) // cell
+            heatmap[top : top + h.shape[0], left : left + h.shape[1]] = h
+    return {
+        "rect": rect,
+        "counts": counts,
+        "biomes": biomes,
+        "heatmap": heatmap,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def report(results: dict, args: argparse.Namespace):  # pylint: disable=too-many-locals
+    """print the results"""
+
+    counts, heatmap = results["counts"], results["heatmap"]
+    total = int(counts.sum())
+    x0, y0, x1, y1 = results["rect"]
+    where = f"within {args.radius} tiles of {SPAWN}" if args.radius else "in total"
+    print(f"region ({x0}, {y0}) to ({x1}, {y1}), {total} tiles {where}")
+    print(f"took {results['seconds']:.2f}s, {total / results['seconds']:.0f} tiles/s")
+    for name, count in zip(TILES, counts):
+        print(f"  {name:>6}: {count:>12} ({count / max(total, 1):.3%})")
+    print("biomes:")
+    for biome, count in zip(BIOMES, results["biomes"]):
+        print(f"  {biome.name:>6}: {count:>12} ({count / max(total, 1):.3%})")
+
+    print(f"enemies per {args.cell}x{args.cell} cell:")
+    values, edges = np.histogram(heatmap, bins=min(10, int(heatmap.max()) + 1))
+    for count, low, high in zip(values, edges, edges[1:]):
+        print(f"  {low:6.1f} - {high:6.1f}: {count}")
+
+    if args.heatmap:
+        np.save(args.heatmap, heatmap)
+        print(f"heatmap saved to {args.heatmap}")
+    if max(heatmap.shape) <= args.ascii:
+        shades = np.minimum(
+            heatmap * len(SHADES) // max(int(heatmap.max()), 1), len(SHADES) - 1
+        )
+        for row in shades:
+            print("".join(SHADES[s] for s in row))
+
+
+def main():
+    """Command line entry point"""
+
+    parser = argparse.ArgumentParser(
+        description="Tile statistics over large regions of the world"
+    )
+    parser.add_argument("--seed", type=int, default=WORLD_SEED)
+    parser.add_argument("--x0", type=int, default=-1024)
+    parser.add_argument("--y0", type=int, default=-1024)
+    parser.add_argument("--x1", type=int, default=1024)
+    parser.add_argument("--y1", type=int, default=1024)
+    parser.add_argument(
+        "--radius", type=float, help="only count tiles this close to the spawn"
+    )
+    parser.add_argument("--cell", type=int, default=32, help="heatmap cell size")
+    parser.add_argument("--block", type=int, default=512, help="tiles per task side")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--heatmap", help="save the enemy heatmap as .npy")
+    parser.add_argument(
+        "--ascii", type=int, default=64, help="print heatmaps up to this many cells"
+    )
+    args = parser.parse_args()
+    report(run(args), args)
+
+
+if __name__ == "__main__":
+    main()
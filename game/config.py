@@ -7,6 +7,31 @@ SCREEN_HEIGHT = 640
 SCREEN_WIDTH = 640
 FPS = 60
 TILE_SIZE = 72  # ceil(screen_size/9)
+MAP_SCROLL_SPEED = 10  # tiles per second the map camera scrolls
+MAP_WALK_SPEED = 8  # tiles per second the player walks along a path or holding a key
+MINIMAP_SIZE = (128, 48)  # tiles around the player on the minimap, a pixel each
+MAP_ZOOM_LEVELS = (9, 17, 33, 65, 129)  # tiles across the map, sprites only at 9
+SPRITESHEET = "assets/spritesheet.png"  # baked by `python -m game.utils.spritesheet`
+
+# World
+WORLD_SEED = 0x5EED
+CHUNK_SIZE = 32  # tiles per side of a cached world chunk
+CHUNK_CACHE_BYTES = 4 * 1024 * 1024  # memory bound of the chunk cache
+WORLD_ATLAS = None  # path to a baked world atlas, see game.world.atlas
+BIOME_SCALE = 48  # tiles between the points of the biome noise lattice
+PREFETCH_DISTANCE = 48  # tiles ahead of the viewport generated in the background
+SIMULATION_INTERVAL = 0.5  # seconds between ticks of the chunks near the player
+SIMULATION_RADIUS = 2  # chunks around the player's chunk that are simulated
+SIMULATION_WORKERS = 2  # processes ticking the chunks
+ENEMY_RESPAWN_TIME = 180  # seconds until a defeated enemy respawns
+ROAMING_RADIUS = 2  # chunks around the player's chunk where enemies roam
+ENEMY_WANDER_TIME = 1.5  # average seconds between the steps of a wandering enemy
+ENEMY_CHASE_TIME = 0.5  # seconds between the steps of an enemy chasing the player
+ENEMY_CHASE_RADIUS = 4  # tiles from the player where enemies start chasing
+ENEMY_LEASH = 6  # tiles an enemy wanders from its spawn
+PATH_BUDGET = 4096  # tiles a single path search visits at most
+PATH_MARGIN = 16  # tiles around the start and goal a path may detour through
+PATH_CACHE_SIZE = 64  # paths kept until the removed objects change
 
 # Logger
 LOGGER_LEVEL = logging.DEBUG  # development
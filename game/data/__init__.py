@@ -3,11 +3,12 @@
 import json
 import time
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from json import JSONDecodeError
 
 from game.config import MAX_SLOTS
 from game.logger import logger
+from game.world import ChunkBitset
 
 if typing.TYPE_CHECKING:
     from game.views.map import GameState
@@ -21,10 +22,11 @@ class SlotData:
 
     time: int
     loc: list
-    removed: set[tuple]
+    removed: ChunkBitset
     health: int
     xp: int
     coins: int
+    explored: ChunkBitset = field(default_factory=ChunkBitset)
 
     def to_dict(self) -> dict:
         """convert the slots back to dictionary"""
@@ -32,6 +34,8 @@ class SlotData:
             "time": self.time,
             "loc": self.loc,
             "removed": [list(pos) for pos in self.removed],
+            # a few bits per tile, base64 bitmaps of whole chunks
+            "explored": self.explored.to_list(),
             "attributes": {
                 "health": self.health,
                 "xp": self.xp,
@@ -53,7 +57,9 @@ class Data:
         self.slots = [
             SlotData(
                 time=slot["time"],
-                removed={tuple(s) for s in slot["removed"]},
+                removed=ChunkBitset(tuple(s) for s in slot["removed"]),
+                # older saves didn't track it
+                explored=ChunkBitset.from_list(slot.get("explored", [])),
                 loc=slot["loc"],
                 health=slot["attributes"]["health"],
                 xp=slot["attributes"]["xp"],
@@ -82,7 +88,9 @@ class Data:
         return SlotData(
             time=int(time.time()),
             loc=level_state.loc,
-            removed=level_state.removed,
+            # copies, the level keeps changing its sets after saving
+            removed=level_state.removed.copy(),
+            explored=level_state.explored.copy(),
             health=attributes.health,
             xp=attributes.xp,
             coins=game_state.coins,
@@ -1,8 +1,9 @@
 """This module implements States used in various views"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from game.data import logger
 from game.entities.player import PlayerAttributes
+from game.world import ChunkBitset
 
 logger = logger.getChild("states")
 
@@ -14,18 +15,35 @@ class LevelState:
     # to store current player absolute position
     _loc: list
     # to store removed items
-    _removed: set[tuple]
+    _removed: ChunkBitset
+    # to store the positions the player has seen
+    _explored: ChunkBitset = field(default_factory=ChunkBitset)
+
+    def __post_init__(self):
+        if not isinstance(self._removed, ChunkBitset):
+            self._removed = ChunkBitset(self._removed)
+        if self._explored is None:
+            self._explored = ChunkBitset()
 
     def get(self):
         """get the current state"""
         logger.debug(f"get {self.loc}, {self.removed}")
         return self.loc, self.removed
 
-    def set(self, loc: list, removed: set[tuple]):
-        """get the current state"""
+    def set(
+        self,
+        loc: list,
+        removed: ChunkBitset | set[tuple],
+        explored: ChunkBitset | None = None,
+    ):
+        """get the current state, the explored positions are kept if not given"""
         logger.debug(f"set {loc}, {removed}")
         self._loc = loc
-        self._removed = removed
+        self._removed = (
+            removed if isinstance(removed, ChunkBitset) else ChunkBitset(removed)
+        )
+        if explored is not None:
+            self._explored = explored
 
     @property
     def loc(self):
@@ -37,10 +55,16 @@ class LevelState:
         """get the positions for removed objects"""
         return self._removed
 
+    @property
+    def explored(self):
+        """get the positions the player has seen"""
+        return self._explored
+
     def reset(self):
         """reset to default values"""
         self._loc = [0, 0]
-        self._removed = set()
+        self._removed = ChunkBitset()
+        self._explored = ChunkBitset()
 
 
 @dataclass
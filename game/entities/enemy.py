@@ -1,10 +1,10 @@
 """This module contains the Enemy class"""
 
-import pygame.image
 from pygame import Surface
 from pygame.sprite import Sprite
 
 from game.entities.player import PlayerAttributes
+from game.utils.assets import assets
 
 
 class Enemy(Sprite):
@@ -13,10 +13,8 @@ class Enemy(Sprite):
     def __init__(self, scale=(64, 64)):
         """Initialize the enemy"""
         super().__init__()
-        self.image = pygame.transform.scale(
-            pygame.image.load("assets/enemy.png"), scale
-        )
-        self.scale = scale
+        self.scale = tuple(scale)
+        self.image = assets.image("assets/enemy.png", self.scale)
         self.rect = self.image.get_rect()
         self.details = ["I am Quantalocus.", "A deadly Alien with no special abilities"]
         self.visible = True
@@ -57,7 +55,7 @@ class Enemy(Sprite):
     def draw(self, screen: Surface, pos_x, pos_y, scale=None):
         """Draw the enemy"""
         if scale is not None and self.scale != scale:
-            self.scale = scale
-            self.image = pygame.transform.scale(self.image, scale)
+            self.scale = tuple(scale)
+            self.image = assets.image("assets/enemy.png", self.scale)
 
         screen.blit(self.image, (pos_x, pos_y))
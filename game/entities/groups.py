@@ -11,6 +11,7 @@ from game.config import STORE_PADDING
 from game.custom_event import ITEM_FOCUSED, LEFT_CLICK
 from game.entities.item import ItemTypes, StoreItem
 from game.logger import logger
+from game.utils import SpriteBatch
 
 logger = logger.getChild("entities.item")
 
@@ -40,6 +41,9 @@ class StoreItems(Group):
         # currently active item
         self.active_item = None
 
+        # the items drawn in one call
+        self.batch = SpriteBatch()
+
     def add_internal(self, sprite, layer: None = None) -> None:
         self.spritedict[sprite] = None
         # sorted manner
@@ -70,10 +74,14 @@ class StoreItems(Group):
         if self.items_changed:
             self._on_item_changed(surface)
             return
+        self.batch.clear()
         for sprite, pos in self.sprite_pos.items():
-            self.sprite_rects.update(sprite.draw(surface, pos))
+            card = sprite.render()
+            dest = self.batch.add(card, Vector2(pos) + sprite.offset)
+            self.sprite_rects[sprite] = card.get_rect(topleft=dest)
             if self.active_item:
                 sprite.on_focus = sprite.name == self.active_item.name
+        self.batch.draw(surface)
 
     def _on_item_changed(self, surface):
         """run if items were changed, recalculate the offsets and rects"""
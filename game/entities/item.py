@@ -11,6 +11,7 @@ from pygame.sprite import Sprite
 from game.config import STORE_PADDING, STORE_BG, TILE_SIZE, STORE_ON_FOCUS
 from game.logger import logger
 from game.utils import Text, Button
+from game.utils.assets import assets
 from game.utils.div import Div, Scrollable
 
 logger = logger.getChild("entities.item")
@@ -84,15 +85,17 @@ class StoreItem(Sprite, Scrollable):
         self.item = getattr(AllItems, item_id)
         self.type = self.item.type
         self.name = self.item.item_name
-        self.image = pygame.transform.scale(
-            pygame.image.load(self.item.img_path), (TILE_SIZE, TILE_SIZE)
-        )
+        self.image = assets.image(self.item.img_path, (TILE_SIZE, TILE_SIZE))
         self.rect = self.image.get_rect()
         self.on_focus = False
+        # focus -> the rendered item, with its name
+        self._cards: dict[bool, Surface] = {}
 
-    def draw(self, screen: Surface, pos) -> dict["Self", RectType]:
-        """Draw the item"""
+    def render(self) -> Surface:
+        """Render the item and its name, once for each focus state"""
 
+        if (surface := self._cards.get(self.on_focus)) is not None:
+            return surface
         surface = Surface((STORE_PADDING, STORE_PADDING), pygame.SRCALPHA)
         if self.on_focus:
             surface.fill(STORE_ON_FOCUS)
@@ -106,6 +109,13 @@ class StoreItem(Sprite, Scrollable):
         )
         name.blit_into(surface)
         surface.blit(self.image, (STORE_PADDING / 2 - TILE_SIZE / 2, 0))
+        self._cards[self.on_focus] = surface
+        return surface
+
+    def draw(self, screen: Surface, pos) -> dict["Self", RectType]:
+        """Draw the item"""
+
+        surface = self.render()
         screen.blit(surface, Vector2(pos) + self.offset)
 
         rect = surface.get_rect()
@@ -5,6 +5,8 @@ import pygame.image
 from pygame import Surface
 from pygame.sprite import Sprite
 
+from game.utils.assets import assets
+
 
 @dataclass
 class PlayerAttributes:
@@ -21,9 +23,7 @@ class Player(Sprite):
         """Initialize the player"""
         super().__init__()
         self.scale = (64, 96)
-        self.image = pygame.transform.scale(
-            pygame.image.load("assets/player.png"), self.scale
-        ).convert_alpha()
+        self.image = assets.image("assets/player.png", self.scale)
         self.pos = self.image.get_width() / 2, self.image.get_height() / 2
         self.rect = self.image.get_rect()
         self.attributes = PlayerAttributes(
@@ -56,18 +56,14 @@ class Player(Sprite):
 
     def draw(self, screen: Surface, pos=None, scale=None):
         """Draw the player"""
-        if scale is not None and self.scale != scale:
-            self.scale = scale
-            self.image = pygame.transform.scale(self.image, scale)
-
-        if self.attributes.health <= 0:
-            # ghost mode!
-            if not self.is_ghost:
-                self.image.set_alpha(120)
-                self.is_ghost = True
-        elif self.is_ghost:
-            self.is_ghost = False
-            self.image.set_alpha(255)
+        if scale is not None:
+            self.scale = tuple(scale)
+        # ghost mode!
+        self.is_ghost = self.attributes.health <= 0
+        # the asset manager keeps each size and transparency once
+        self.image = assets.image(
+            "assets/player.png", self.scale, alpha=120 if self.is_ghost else None
+        )
 
         if pos is None:
             screen.blit(
@@ -1,19 +1,34 @@
 """Generate a level"""
 
-# p is player
-# e is Enemy -> En can be a way to have many different enemies
-# w is wall -> Wn can be a way to have more obstacles
-# x is walkable
+# tiles are ids of the tile types in game.world.tiles, new kinds of enemies and
+# obstacles are added by registering a tile type
 
-import random
+from collections.abc import Iterable
 
 import numpy as np
 from numpy.typing import NDArray
 
+from game.common_types import AnyPath
+from game.config import WORLD_ATLAS, WORLD_SEED
 from game.custom_event import ENEMY_ENCOUNTERED
 from game.data import game_data
 from game.data.states import LevelState
 from game.logger import logger
+from game.world import (
+    ChunkBitset,
+    ChunkCache,
+    TILE_FLOOR,
+    TILE_NONE,
+    TILE_PLAYER,
+    ChunkSimulation,
+    Layer,
+    Pathfinder,
+    Prefetcher,
+    RoamingEnemies,
+    split_layers,
+)
+from game.world.atlas import WorldAtlas
+from game.world.tiles import ENCOUNTER, WALKABLE
 
 logger = logger.getChild("level_gen")
 
@@ -21,41 +36,228 @@ logger = logger.getChild("level_gen")
 class Level:
     """Class for generating a level"""
 
-    def __init__(self):
-        """Initialize the level"""
+    def __init__(self, seed: int = WORLD_SEED, atlas: AnyPath | None = WORLD_ATLAS):
+        """
+        Initialize the level
+
+        :param seed: world seed
+        :param atlas: path to a baked world atlas, tiles outside it are generated
+        """
+
+        # terrain and object layers of the 9x9 window around the player
+        self.tiles = np.full((len(Layer), 9, 9), TILE_NONE, dtype=np.uint8)
+        self.tiles[Layer.TERRAIN] = TILE_FLOOR
+        self.state = LevelState([0, 0], ChunkBitset())
+        self.seed = seed
+        world_atlas = WorldAtlas(atlas) if atlas else None
+        if world_atlas and world_atlas.seed != seed:
+            logger.warning(f"atlas {atlas} was baked for another seed, ignoring it")
+            world_atlas = None
+        if world_atlas and not world_atlas.matches():
+            logger.warning(f"atlas {atlas} was baked by another generator, ignoring it")
+            world_atlas = None
+        # generated terrain, shared by every window over the world
+        self.chunks = ChunkCache(seed, atlas=world_atlas)
+        # keeps the chunks ahead of the player resident
+        self.prefetcher = Prefetcher(self.chunks)
+        # ticks the chunks around the player in worker processes
+        self.simulation = ChunkSimulation(seed)
+        # the enemies of the chunks around the player, they wander off their tiles
+        self.enemies = RoamingEnemies(self.chunks, seed)
+        # paths around the walls and objects, not around the roaming enemies
+        self.paths = Pathfinder(
+            self.walkable,
+            lambda: (self.state.removed.version, self.enemies.homes.version),
+        )
 
-        self.matrix = np.full((9, 9), ord("x"), dtype=np.int8)
-        self.state = LevelState([0, 0], set())
-        self.rng = random.Random(str(self.state.loc))
+        # location the matrix was last generated for
+        self._synced_loc = None
 
         # save state before becoming a ghost
         self.preghost = None
         self.is_ghost = False
 
+    @property
+    def player_pos(self) -> tuple[int, int]:
+        """absolute position of the player"""
+        return self._get_abs_pos((4, 4))
+
+    @property
+    def matrix(self) -> NDArray:
+        """the top tile of each cell of the window, the object if there is one"""
+        terrain, objects = self.tiles
+        return np.where(objects != TILE_NONE, objects, terrain)
+
     def _get_tile(self, at: tuple) -> int:
         """Get a tile"""
 
         if at == (4, 4):
-            return ord("p")
-        if self._get_abs_pos(at) in self.state.removed:
-            return ord("x")
+            return TILE_PLAYER
+        return self.tile(*self._get_abs_pos(at))
 
-        seed = str(list(self._get_abs_pos(at)))
-        self.rng.seed(seed)
-        return ord(self.rng.choice("x" * 800 + "w" * 185 + "e" * 15))
+    def tile(self, x: int, y: int) -> int:
+        """get the top tile at an absolute position, without the player"""
+        if (index := self.enemies.at(x, y)) is not None:
+            return int(self.enemies.kind[index])
+        if (x, y) in self.state.removed or (x, y) in self.enemies.homes:
+            return TILE_FLOOR
+        return self.chunks.tile(x, y)
 
     def _get_abs_pos(self, rel_pos: tuple) -> tuple:
         """get absolute position on the map"""
         # rel_pos is transposed as matrix is stored column major
         return self.state.loc[0] - rel_pos[1], self.state.loc[1] - rel_pos[0]
 
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> NDArray:
+        """
+        Get the tiles of any rectangle of the world, removed objects excluded
+
+        :param x0: first absolute x, inclusive
+        :param y0: first absolute y, inclusive
+        :param x1: last absolute x, exclusive
+        :param y1: last absolute y, exclusive
+        :return: uint8 array of tile ids indexed [y - y0, x - x0], without the player
+        """
+        block = self.chunks.region(x0, y0, x1, y1)
+        block[
+            self.state.removed.mask(x0, y0, x1, y1)
+            | self.enemies.homes.mask(x0, y0, x1, y1)
+        ] = TILE_FLOOR
+        self.enemies.paint(block, x0, y0)
+        return block
+
+    def walkable(self, x0: int, y0: int, x1: int, y1: int) -> NDArray:
+        """
+        Get which tiles of any rectangle of the world the player can walk through,
+        the roaming enemies are left out as they don't stay in place
+
+        :param x0: first absolute x, inclusive
+        :param y0: first absolute y, inclusive
+        :param x1: last absolute x, exclusive
+        :param y1: last absolute y, exclusive
+        :return: bool array indexed [y - y0, x - x0]
+        """
+        block = self.chunks.region(x0, y0, x1, y1)
+        block[
+            self.state.removed.mask(x0, y0, x1, y1)
+            | self.enemies.homes.mask(x0, y0, x1, y1)
+        ] = TILE_FLOOR
+        return WALKABLE[block]
+
+    def _route(self, path: list[tuple[int, int]] | None) -> list[tuple[int, int]]:
+        """turn a path from the player into the (dx, dy) of each move"""
+        if not path:
+            return []
+        xs, ys = zip(self.player_pos, *path)
+        return list(zip(np.diff(xs).tolist(), np.diff(ys).tolist()))
+
+    def route_to(self, pos: tuple[int, int]) -> list[tuple[int, int]]:
+        """the moves along a shortest path to an absolute position, if any"""
+        return self._route(self.paths.path(self.player_pos, pos))
+
+    def route_to_enemy(self) -> list[tuple[int, int]]:
+        """the moves along a shortest path to the closest enemy, if any"""
+        enemies = np.stack((self.enemies.x, self.enemies.y), axis=1)
+        return self._route(self.paths.nearest(self.player_pos, enemies))
+
+    def _window(self, rows: slice, cols: slice) -> NDArray:
+        """generate the layers of a rectangular part of the window"""
+
+        # the region is indexed [y, x], the window runs the other way on both axes
+        x, y = self._get_abs_pos((rows.stop - 1, cols.stop - 1))
+        return split_layers(
+            self.region(x, y, x + cols.stop - cols.start, y + rows.stop - rows.start)[
+                ::-1, ::-1
+            ]
+        )
+
     def generate(self) -> NDArray:
         """Generate a level"""
 
-        for idx, _ in np.ndenumerate(self.matrix):
-            self.matrix[idx] = self._get_tile(idx)
-        self.matrix[(4, 4)] = ord("p")
-        return self.matrix
+        self.enemies.follow(self.player_pos, self.state.removed)
+        self.tiles[...] = self._window(slice(0, 9), slice(0, 9))
+        self.tiles[Layer.OBJECT, 4, 4] = TILE_PLAYER
+        self._synced_loc = tuple(self.state.loc)
+        self._explore()
+        return self.tiles
+
+    def around(self, radius: int) -> NDArray:
+        """
+        Generate the top tiles of a square around the player, oriented like the matrix
+
+        :param radius: tiles on each side of the player
+        :return: uint8 array of tile ids with the player in the middle
+        """
+        x, y = self._get_abs_pos((4 + radius, 4 + radius))
+        size = 2 * radius + 1
+        tiles = self.region(x, y, x + size, y + size)[::-1, ::-1]
+        tiles[radius, radius] = TILE_PLAYER
+        return tiles
+
+    def border(self, size: int) -> list[tuple[slice, slice, NDArray]]:
+        """
+        Generate the tiles around the matrix, for drawing past its edges
+
+        :param size: tiles on each side of the matrix
+        :return: (rows, cols, layers) of the strips above, below, left and right of the
+            matrix, the slices run past the matrix bounds
+        """
+        n = self.tiles.shape[1]
+        strips = (
+            (slice(-size, 0), slice(-size, n + size)),
+            (slice(n, n + size), slice(-size, n + size)),
+            (slice(0, n), slice(-size, 0)),
+            (slice(0, n), slice(n, n + size)),
+        )
+        return [(rows, cols, self._window(rows, cols)) for rows, cols in strips]
+
+    def scroll(self) -> tuple[tuple[int, int] | None, list[tuple[slice, slice]]]:
+        """
+        Bring the matrix up to date with the current location by shifting it and
+        generating only the newly exposed tiles
+
+        :return: the (rows, cols) shift, None if the matrix was regenerated, and the
+            regions of the matrix whose tiles changed
+        """
+        if self._synced_loc is None:
+            self.generate()
+            return None, [(slice(0, 9), slice(0, 9))]
+        dx = self.state.loc[0] - self._synced_loc[0]
+        dy = self.state.loc[1] - self._synced_loc[1]
+        if not dx and not dy:
+            return (0, 0), []
+        if abs(dx) >= 9 or abs(dy) >= 9:
+            self.generate()
+            return None, [(slice(0, 9), slice(0, 9))]
+
+        # shift what's still visible
+        dst_rows, src_rows = (
+            (slice(dy, 9), slice(0, 9 - dy))
+            if dy >= 0
+            else (slice(0, 9 + dy), slice(-dy, 9))
+        )
+        dst_cols, src_cols = (
+            (slice(dx, 9), slice(0, 9 - dx))
+            if dx >= 0
+            else (slice(0, 9 + dx), slice(-dx, 9))
+        )
+        self.tiles[:, dst_rows, dst_cols] = self.tiles[:, src_rows, src_cols]
+
+        # newly exposed rows, then columns, then the tile the player left
+        regions = []
+        if dy:
+            regions.append((slice(0, dy) if dy > 0 else slice(9 + dy, 9), slice(0, 9)))
+        if dx:
+            regions.append((dst_rows, slice(0, dx) if dx > 0 else slice(9 + dx, 9)))
+        if abs(dy) <= 4 and abs(dx) <= 4:
+            regions.append((slice(4 + dy, 5 + dy), slice(4 + dx, 5 + dx)))
+        for rows, cols in regions:
+            self.tiles[:, rows, cols] = self._window(rows, cols)
+        self.tiles[Layer.OBJECT, 4, 4] = TILE_PLAYER
+        regions.append((slice(4, 5), slice(4, 5)))
+
+        self._synced_loc = tuple(self.state.loc)
+        return (dy, dx), regions
 
     def move(self, dx, dy) -> bool:
         """Move the whole map in the given direction"""
@@ -68,19 +270,96 @@ class Level:
                     self.state.removed,
                 )
             self.state.set(list(self._get_abs_pos((-dy, -dx))), self.state.removed)
+            self._moved(dx, dy)
             return True
         if self.is_ghost:
             self.is_ghost = False
             self.state.set(*self.preghost)
 
-        if self.matrix[(4 - dy, 4 - dx)] == ord("e"):
+        # looked up rather than read off the matrix, which may be steps behind
+        target = self._get_abs_pos((4 - dy, 4 - dx))
+        if self.enemies.at(*target) is not None:
             ENEMY_ENCOUNTERED.post({"pos": (4 - dy, 4 - dx)})
             return False
-        if self.matrix[(4 - dy, 4 - dx)] == ord("x"):
+        if WALKABLE[self.tile(*target)]:
             self.state.set(list(self._get_abs_pos((-dy, -dx))), self.state.removed)
+            self._moved(dx, dy)
             return True
         return False
 
+    def _moved(self, dx, dy):
+        """prefetch ahead of the viewport, explore it and bring the enemies along"""
+        x, y = self._get_abs_pos((8, 8))
+        self.prefetcher.observe((x, y, x + 9, y + 9), dx, dy)
+        self._explore()
+        self.enemies.follow(self.player_pos, self.state.removed)
+
+    def _explore(self):
+        """mark the viewport as explored"""
+        x, y = self._get_abs_pos((8, 8))
+        self.state.explored.add_rect(x, y, x + 9, y + 9)
+
+    def simulate(self, radius: int = 4) -> tuple[bool, NDArray]:
+        """
+        Called between frames, merge the simulated chunks into the level state and
+        step the roaming enemies, an enemy reaching the player starts a battle
+
+        :param radius: tiles watched on each side of the player, nothing respawns
+            inside them
+        :return: True if the tiles around the player have to be regenerated, and the
+            absolute (x, y) of the watched tiles the roaming enemies changed
+        """
+        px, py = self.player_pos
+        view = (px - radius, py - radius, px + radius + 1, py + radius + 1)
+        regenerate = False
+        if self.simulation.update(self.state.removed, self.player_pos, view):
+            self.enemies.respawn(self.state.removed, view)
+            self._synced_loc = None
+            regenerate = True
+        cells = self.enemies.update(
+            self.player_pos, view, chase=not game_data.get_temp("ghost")
+        )
+        if self.enemies.attacker is not None:
+            ex, ey = self.enemies.attacker
+            ENEMY_ENCOUNTERED.post(
+                {"pos": (self.state.loc[1] - ey, self.state.loc[0] - ex)}
+            )
+        return regenerate, cells
+
+    def refresh(
+        self, cells: NDArray, margin: int
+    ) -> list[tuple[slice, slice, NDArray]]:
+        """
+        Generate single tiles of the matrix, and of the border around it, again
+
+        :param cells: absolute (x, y) of the tiles that changed
+        :param margin: tiles on each side of the matrix
+        :return: (rows, cols, layers) of each of those tiles within the margin, the
+            slices run past the matrix bounds like the border's
+        """
+        if self._synced_loc != tuple(self.state.loc):
+            # the whole matrix is brought up to date by the next scroll
+            return []
+        n = self.tiles.shape[1]
+        changed = []
+        for x, y in cells.tolist():
+            row, col = self.state.loc[1] - y, self.state.loc[0] - x
+            if not (-margin <= row < n + margin and -margin <= col < n + margin):
+                continue
+            rows, cols = slice(row, row + 1), slice(col, col + 1)
+            layers = self._window(rows, cols)
+            if 0 <= row < n and 0 <= col < n:
+                if (row, col) == (4, 4):
+                    continue
+                self.tiles[:, rows, cols] = layers
+            changed.append((rows, cols, layers))
+        return changed
+
+    def close(self):
+        """stop the background work, when the game quits"""
+        self.prefetcher.stop()
+        self.simulation.close()
+
     def remove_object(self, abs_pos: tuple) -> None:
         """
         remove an object from the map
@@ -90,10 +369,88 @@ class Level:
         """
         self.state.removed.add(abs_pos)
 
+    def remove_area(
+        self, x0: int, y0: int, mask: NDArray, tiles: Iterable[int] | None = None
+    ) -> int:
+        """
+        Remove the walls and enemies of any area of the world at once, the enemies
+        respawn as if defeated
+
+        The matrix is only marked for regeneration, the caller refreshes the view,
+        with Screen.scroll() for the map.
+
+        :param x0: absolute x of the first column
+        :param y0: absolute y of the first row
+        :param mask: bool array indexed [y - y0, x - x0], True for the affected tiles
+        :param tiles: ids of the tiles to remove, everything the player can't walk
+            through if None
+        :return: the number of tiles removed
+        """
+        lookup = ~WALKABLE if tiles is None else np.isin(np.arange(256), list(tiles))
+        removed = self.state.removed
+        rect = (x0, y0, x0 + mask.shape[1], y0 + mask.shape[0])
+        generated = self.chunks.region(*rect)
+        hits = (
+            mask
+            & lookup[generated]
+            & ~removed.mask(*rect)
+            # their enemies roam, they are hit where they are
+            & ~self.enemies.homes.mask(*rect)
+        )
+        # roaming enemies are removed by their spawn
+        spawns = self.enemies.remove_in(x0, y0, mask, lookup)
+
+        removed.add_mask(x0, y0, hits)
+        for pos in spawns:
+            removed.add(pos)
+        ys, xs = np.nonzero(hits & ENCOUNTER[generated])
+        for pos in spawns + list(zip((xs + x0).tolist(), (ys + y0).tolist())):
+            self.simulation.schedule_respawn(pos)
+        self.enemies.open_tiles(x0, y0, hits & ~ENCOUNTER[generated])
+        self._synced_loc = None
+
+        count = int(np.count_nonzero(hits)) + len(spawns)
+        logger.debug(f"removed {count} tiles around ({x0}, {y0})")
+        return count
+
+    def remove_rect(
+        self, x0: int, y0: int, x1: int, y1: int, tiles: Iterable[int] | None = None
+    ) -> int:
+        """
+        Remove the walls and enemies of a rectangle of the world, see remove_area
+
+        :param x0: first absolute x, inclusive
+        :param y0: first absolute y, inclusive
+        :param x1: last absolute x, exclusive
+        :param y1: last absolute y, exclusive
+        :param tiles: ids of the tiles to remove, every obstacle if None
+        :return: the number of tiles removed
+        """
+        return self.remove_area(x0, y0, np.ones((y1 - y0, x1 - x0), dtype=bool), tiles)
+
+    def remove_radius(
+        self, center: tuple[int, int], radius: float, tiles: Iterable[int] | None = None
+    ) -> int:
+        """
+        Remove the walls and enemies within a distance of a position, see remove_area
+
+        :param center: absolute position
+        :param radius: tiles from the center, inclusive
+        :param tiles: ids of the tiles to remove, every obstacle if None
+        :return: the number of tiles removed
+        """
+        r = int(radius)
+        x0, y0 = center[0] - r, center[1] - r
+        dx = np.arange(-r, r + 1)
+        dy = dx[:, None]
+        return self.remove_area(x0, y0, dx * dx + dy * dy <= radius * radius, tiles)
+
     def remove_enemy(self, rel_pos: tuple):
-        """remove enemy from the map"""
+        """remove enemy from the map, it respawns where it spawned"""
         # check enemy
-        assert self.matrix[(*rel_pos,)] == ord(
-            "e"
-        ), f"No enemy was found at position {rel_pos}"
-        self.remove_object(tuple(self._get_abs_pos(rel_pos)))
+        index = self.enemies.at(*self._get_abs_pos(rel_pos))
+        assert index is not None, f"No enemy was found at position {rel_pos}"
+        home = self.enemies.home(index)
+        self.enemies.remove(index)
+        self.remove_object(home)
+        self.simulation.schedule_respawn(home)
@@ -1,8 +1,18 @@
 """ Contains helper functions and classes to speed up development"""
 
+from .batch import SpriteBatch
 from .button import Button, MenuButton
 from .cache import Cache
 from .eventhandler import EventHandler
+from .hud import Hud
 from .text import Text
 
-__all__ = ["Text", "Button", "MenuButton", "Cache", "EventHandler"]
+__all__ = [
+    "Text",
+    "Button",
+    "MenuButton",
+    "Cache",
+    "EventHandler",
+    "Hud",
+    "SpriteBatch",
+]
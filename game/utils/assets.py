@@ -0,0 +1,152 @@
+""" Load the game's images once and share them between sprites """
+
+import time
+from typing import Optional
+
+import pygame
+from pygame import Surface
+
+from game.logger import logger
+from game.utils import spritesheet
+
+logger = logger.getChild("utils.assets")
+
+# (path, size, angle, alpha), size is None for the original image
+Key = tuple[str, Optional[tuple[int, int]], int, Optional[int]]
+
+
+class Assets:
+    """Loads, scales and converts each image once per requested variant"""
+
+    def __init__(self):
+        # key -> surface, rotated and transparent variants are made from the
+        # image at their size
+        self._images: dict[Key, Surface] = {}
+        # images converted to the display format
+        self._converted: set[Key] = set()
+        # the baked spritesheet and its index, False if there is none
+        self._sheet: tuple[Surface, dict] | bool | None = None
+
+        # accounting
+        self.load_time = 0.0
+        self.loads = 0
+        self.requests = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    @staticmethod
+    def _convert(surface: Surface) -> Surface:
+        """convert a surface to the display format, keeps transparency"""
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        # keeps the colorkey, if any
+        return surface.convert()
+
+    def _from_sheet(self, path: str, size) -> Optional[Surface]:
+        """get a sprite from the baked spritesheet, if it was baked"""
+        if self._sheet is None:
+            # decoded once, every sprite is a subsurface of it
+            loaded = spritesheet.load()
+            self._sheet = (loaded[0].convert_alpha(), loaded[1]) if loaded else False
+            self.loads += bool(loaded)
+        if not self._sheet:
+            return None
+        sheet, rects = self._sheet
+        rect = rects.get(spritesheet.sprite_key(path, size))
+        return sheet.subsurface(rect) if rect else None
+
+    def _source(self, path: str) -> Surface:
+        """get the original image, full size originals are only kept if requested"""
+        if (surface := self._images.get((path, None, 0, None))) is not None:
+            return surface
+        self.loads += 1
+        return pygame.image.load(path)
+
+    def image(
+        self,
+        path: str,
+        size: Optional[tuple[int, int]] = None,
+        angle: int = 0,
+        alpha: Optional[int] = None,
+    ) -> Surface:
+        """
+        Get a shared image, loading it if needed
+
+        Callers must not draw on or modify the returned surface, copy it instead.
+
+        :param path: path to the image file
+        :param size: (width, height) to scale to, the original size if None
+        :param angle: degrees to rotate counterclockwise, after scaling
+        :param alpha: transparency of the whole image, unchanged if None
+        :return: the shared surface
+        """
+        self.requests += 1
+        return self._get(
+            (path, tuple(size) if size is not None else None, angle % 360, alpha)
+        )
+
+    def _get(self, key: Key) -> Surface:
+        """get the image of a key, making it from the original the first time"""
+        surface = self._images.get(key)
+        # convert as soon as the display is initialised
+        ready = pygame.display.get_surface() is not None
+        if surface is not None and (key in self._converted or not ready):
+            return surface
+
+        path, size, angle, alpha = key
+        if angle or alpha is not None:
+            # variants are made from the shared image at that size
+            surface = self._get((path, size, 0, None))
+            surface = pygame.transform.rotate(surface, angle) if angle else surface
+            if ready:
+                surface = self._convert(surface)
+                self._converted.add(key)
+            elif not angle:
+                surface = surface.copy()
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            self._images[key] = surface
+            return surface
+
+        start = time.perf_counter()
+        if ready and surface is None:
+            surface = self._from_sheet(path, size)
+            if surface is not None:
+                self._converted.add(key)
+        if surface is None:
+            surface = self._source(path)
+            if size is not None:
+                # always scale from the original, never from a scaled copy
+                surface = pygame.transform.scale(surface, size)
+        if ready and key not in self._converted:
+            surface = self._convert(surface)
+            self._converted.add(key)
+        self._images[key] = surface
+        self.load_time += time.perf_counter() - start
+        return surface
+
+    @property
+    def nbytes(self) -> int:
+        """memory held by the pixels of the cached images"""
+        surfaces = [s for s in self._images.values() if s.get_parent() is None]
+        if self._sheet:
+            surfaces.append(self._sheet[0])
+        return sum(s.get_bytesize() * s.get_width() * s.get_height() for s in surfaces)
+
+    def summary(self) -> str:
+        """one line of load time and memory accounting"""
+        return (
+            f"{len(self)} images from {self.loads} files, {self.requests} requests, "
+            f"{self.load_time * 1000:.1f}ms loading, {self.nbytes / 1024:.0f}KiB"
+        )
+
+    def clear(self):
+        """drop all cached images"""
+        self._images.clear()
+        self._converted.clear()
+        self._sheet = None
+
+
+# shared by all sprites
+assets = Assets()
@@ -0,0 +1,33 @@
+""" Draw many surfaces with a single blit call """
+
+from pygame import Surface
+
+
+class SpriteBatch:
+    """A list of (surface, position) pairs drawn with one `Surface.blits` call"""
+
+    def __init__(self):
+        self._blits: list[tuple[Surface, tuple[int, int]]] = []
+
+    def __len__(self):
+        return len(self._blits)
+
+    def add(self, surface: Surface, pos) -> tuple[int, int]:
+        """
+        Queue a surface
+
+        :param surface: the surface to draw
+        :param pos: top left position, rounded down to whole pixels
+        :return: the position it will be drawn at
+        """
+        dest = int(pos[0]), int(pos[1])
+        self._blits.append((surface, dest))
+        return dest
+
+    def clear(self):
+        """forget the queued surfaces"""
+        self._blits.clear()
+
+    def draw(self, target: Surface):
+        """draw every queued surface onto the target"""
+        target.blits(self._blits, doreturn=False)
@@ -75,6 +75,10 @@ class CustomEvent:
             return event
         return None
 
+    def peek(self) -> bool:
+        """check if the event is on the pygame events queue, without taking it"""
+        return pygame.event.peek(self.type)
+
     def wait(self, time, _dict=None, repeat=False) -> None:
         """post this event after waiting for `time` ms"""
         if _dict is None:
@@ -0,0 +1,77 @@
+""" Implements the HUD, overlays rendered again only when they change """
+
+from typing import Callable, Hashable
+
+import pygame
+from pygame import Surface
+
+# draws an element onto the layer
+Draw = Callable[[Surface], None]
+
+
+class Hud:
+    """
+    A retained layer of overlay elements
+
+    Static elements are rendered once, dynamic elements are rendered again only when
+    the value they show changes, drawing the layer is a single blit.
+    """
+
+    def __init__(self, size):
+        """
+        Initialize the layer
+
+        :param size: size of the layer, usually the size of the screen
+        """
+        self.size = int(size[0]), int(size[1])
+        self._static: list[Draw] = []
+        self._dynamic: list[tuple[Callable[[], Hashable], Draw]] = []
+        # static elements only
+        self._background: Surface | None = None
+        # static and dynamic elements
+        self._layer: Surface | None = None
+        self._area: pygame.Rect | None = None
+        self._values = None
+        # how often the layer was rendered, for profiling
+        self.renders = 0
+
+    def add(self, draw: Draw, value: Callable[[], Hashable] | None = None):
+        """
+        Add an element to the layer
+
+        :param draw: draws the element onto the surface it is given
+        :param value: returns what the element shows, the element is static if None
+        """
+        if value is None:
+            self._static.append(draw)
+            self._background = None
+        else:
+            self._dynamic.append((value, draw))
+        self._layer = None
+
+    def invalidate(self):
+        """render everything again on the next draw"""
+        self._background = self._layer = None
+
+    def _render(self):
+        """render the elements into the layer"""
+        if self._background is None:
+            self._background = Surface(self.size, pygame.SRCALPHA)
+            for draw in self._static:
+                draw(self._background)
+        self._layer = self._background
+        if self._dynamic:
+            self._layer = self._background.copy()
+            for _, draw in self._dynamic:
+                draw(self._layer)
+        # only blit the part that has something on it
+        self._area = self._layer.get_bounding_rect()
+        self.renders += 1
+
+    def draw(self, screen: Surface):
+        """draw the layer, rendering what changed since the last draw"""
+        values = tuple(value() for value, _ in self._dynamic)
+        if self._layer is None or values != self._values:
+            self._values = values
+            self._render()
+        screen.blit(self._layer, self._area, self._area)
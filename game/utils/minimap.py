@@ -0,0 +1,118 @@
+"""Implements the minimap, one pixel per tile around the player"""
+
+from typing import Callable
+
+import numpy as np
+import pygame
+from numpy.typing import NDArray
+from pygame import Surface
+
+from game.config import MINIMAP_SIZE
+from game.world.tiles import COLORS, TILE_PLAYER
+
+# colour of the tiles that weren't seen yet
+UNEXPLORED = (0, 0, 0)
+
+# (x0, y0, x1, y1) -> top tile ids and explored mask of that rectangle of the world
+World = Callable[[int, int, int, int], tuple[NDArray, NDArray]]
+
+
+class Minimap:
+    """Keeps the tiles the player has seen around them, updated as they move"""
+
+    def __init__(self, size: tuple[int, int] = MINIMAP_SIZE):
+        """
+        Initialize the minimap
+
+        :param size: (width, height) in tiles, and pixels
+        """
+        self.size = size
+        self.surface: Surface | None = None
+        # absolute position of the player at the centre of the surface
+        self.center: tuple[int, int] | None = None
+        # colour of the tile under the player's pixel
+        self._under = None
+
+    def clear(self):
+        """forget everything that was seen"""
+        self.center = None
+        self._under = None
+        if self.surface is not None:
+            self.surface.fill(UNEXPLORED)
+
+    def update(
+        self,
+        pos: tuple[int, int],
+        regions: list[tuple[slice, slice, NDArray]],
+        world: World | None = None,
+    ):
+        """
+        Follow the player and paint the parts of the level matrix that changed
+
+        :param pos: absolute position of the player
+        :param regions: (rows, cols, top tile ids) of the matrix, without the player
+        :param world: paints the edges scrolled into view from what was explored
+            before, they are left unexplored if None
+        """
+        if self.surface is None:
+            self.surface = Surface(self.size).convert()
+            self.surface.fill(UNEXPLORED)
+        middle = self.size[0] // 2, self.size[1] // 2
+        if self._under is not None:
+            self.surface.set_at(middle, self._under)
+        self._follow(pos, world)
+        for rows, cols, tiles in regions:
+            self._reveal(rows, cols, tiles)
+        self._under = self.surface.get_at(middle)
+        self.surface.set_at(middle, COLORS[TILE_PLAYER])
+
+    def _follow(self, pos: tuple[int, int], world: World | None):
+        """centre the minimap on the player, shifting what was seen along"""
+        width, height = self.size
+        previous, self.center = self.center, tuple(pos)
+        # the screen runs against the world axes, so does the minimap
+        dx, dy = (
+            (pos[0] - previous[0], pos[1] - previous[1])
+            if previous
+            else (width, height)
+        )
+        if abs(dx) >= width or abs(dy) >= height:
+            self._paint((0, 0, width, height), world)
+            return
+        self.surface.scroll(dx, dy)
+        # scrolling leaves the exposed edges as they were
+        if dx:
+            self._paint((0 if dx > 0 else width + dx, 0, abs(dx), height), world)
+        if dy:
+            self._paint((0, 0 if dy > 0 else height + dy, width, abs(dy)), world)
+
+    def _paint(self, rect: tuple[int, int, int, int], world: World | None):
+        """paint a (left, top, width, height) part of the surface from the world"""
+        if world is None:
+            self.surface.fill(UNEXPLORED, rect)
+            return
+        left, top, width, height = rect
+        x0 = self.center[0] + self.size[0] // 2 - (left + width - 1)
+        y0 = self.center[1] + self.size[1] // 2 - (top + height - 1)
+        tiles, explored = world(x0, y0, x0 + width, y0 + height)
+        colors = np.where(explored[..., None], COLORS[tiles], UNEXPLORED)
+        # the rectangle is indexed [y, x], the surface [x, y] against the world
+        pixels = pygame.surfarray.make_surface(
+            colors[::-1, ::-1].transpose(1, 0, 2).astype(np.uint8)
+        )
+        self.surface.blit(pixels, (left, top))
+
+    def _reveal(self, rows: slice, cols: slice, tiles: NDArray):
+        """paint a region of the level matrix, the player is in its middle"""
+        if not tiles.size:
+            return
+        pixels = pygame.surfarray.make_surface(COLORS[tiles].transpose(1, 0, 2))
+        self.surface.blit(
+            pixels,
+            (cols.start - 4 + self.size[0] // 2, rows.start - 4 + self.size[1] // 2),
+        )
+
+    def draw(self, screen: Surface, top_left):
+        """draw the minimap"""
+        if self.surface is not None:
+            screen.blit(self.surface, top_left)
@@ -0,0 +1,109 @@
+""" Bake every sprite at every size the game uses into one image """
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import pygame
+from pygame import Surface
+
+from game.config import SPRITESHEET, TILE_SIZE
+from game.logger import logger
+
+logger = logger.getChild("utils.spritesheet")
+
+# sizes each image is drawn at, None for the original size
+SPRITES: dict[str, list[Optional[tuple[int, int]]]] = {
+    "assets/player.png": [(64, 96), (128, 212)],
+    "assets/enemy.png": [(64, 64), (96, 96)],
+    "assets/wall.png": [(TILE_SIZE, TILE_SIZE)],
+    "assets/knife.png": [(TILE_SIZE, TILE_SIZE)],
+    "assets/shield.png": [(TILE_SIZE, TILE_SIZE)],
+    "assets/potion.png": [(TILE_SIZE, TILE_SIZE)],
+}
+# width of the sheet, sprites are packed in rows
+SHEET_WIDTH = 512
+# gap between sprites so scaled draws don't bleed into neighbours
+PADDING = 1
+
+
+def sprite_key(path: str, size: Optional[tuple[int, int]]) -> str:
+    """key of a sprite in the index"""
+    return path if size is None else f"{path}@{size[0]}x{size[1]}"
+
+
+def _index_path(sheet: str) -> Path:
+    """the index is stored next to the sheet"""
+    return Path(sheet).with_suffix(".json")
+
+
+def build(sheet: str = SPRITESHEET):  # pylint: disable=too-many-locals
+    """
+    Pack the sprites into one image with shelf packing and write the index
+
+    :param sheet: destination .png, the index is written next to it as .json
+    """
+    sprites = []
+    for path, sizes in SPRITES.items():
+        original = pygame.image.load(path)
+        for size in sizes:
+            sprites.append(
+                (
+                    sprite_key(path, size),
+                    original
+                    if size is None
+                    else pygame.transform.scale(original, size),
+                )
+            )
+    # tallest first keeps the rows tight
+    sprites.sort(key=lambda sprite: sprite[1].get_height(), reverse=True)
+
+    rects = {}
+    x = y = row_height = 0
+    for key, surface in sprites:
+        width, height = surface.get_size()
+        if x + width > SHEET_WIDTH:
+            x, y, row_height = 0, y + row_height + PADDING, 0
+        rects[key] = (x, y, width, height)
+        x += width + PADDING
+        row_height = max(row_height, height)
+
+    image = Surface((SHEET_WIDTH, y + row_height), pygame.SRCALPHA)
+    for key, surface in sprites:
+        image.blit(surface, rects[key][:2])
+    pygame.image.save(image, sheet)
+    with open(_index_path(sheet), "w+", encoding="utf-8") as f:
+        json.dump(
+            {
+                "sources": {path: os.path.getmtime(path) for path in SPRITES},
+                "rects": rects,
+            },
+            f,
+        )
+    logger.info(f"packed {len(rects)} sprites into {sheet} {image.get_size()}")
+
+
+def load(sheet: str = SPRITESHEET) -> tuple[Surface, dict[str, tuple]] | None:
+    """
+    Load the baked sheet and its index
+
+    :return: the sheet and the rects of the sprites, None if the sheet is missing or
+        older than one of its sources
+    """
+    try:
+        with open(_index_path(sheet), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        for path, mtime in index["sources"].items():
+            if os.path.getmtime(path) > mtime:
+                logger.warning(f"{path} changed, rebuild the spritesheet")
+                return None
+        image = pygame.image.load(sheet)
+    except (FileNotFoundError, pygame.error):
+        logger.debug(f"no spritesheet at {sheet}, loading images one by one")
+        return None
+    return image, index["rects"]
+
+
+if __name__ == "__main__":
+    build()
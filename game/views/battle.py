@@ -10,7 +10,7 @@ from game.data import game_data
 from game.data.states import GameState
 from game.entities.enemy import Enemy
 from game.entities.player import Player
-from game.utils import Text
+from game.utils import Hud, Text
 from game.utils.bar import HealthBar
 from game.views import View, logger
 
@@ -58,6 +58,13 @@ class Battle(View):
         self.my_turn = True
         self.result = ""  # "lost" or "won"
 
+        # ------ layers ------ #
+        # drawn under the player and the enemy
+        self.backdrop = Hud(self.size)
+        self.hud = Hud(self.size)
+        self.results = Hud(self.size)
+        self._build_hud()
+
     def pre_run(self, _spl_args) -> None:
         # get the game view before running this view
         if e := PASS_VIEW.get():
@@ -75,111 +82,49 @@ class Battle(View):
             num_attacks + self.num_buttons_per_row - 1
         ) // self.num_buttons_per_row
 
-    def on_draw(self) -> None:
-        """Draw the battle view"""
-        if not getattr(self, "game_view"):
-            raise RuntimeError(
-                "Battle was not initiated properly, use PASS_VIEW to pass the Map "
-                "view"
+    def _build_hud(self):
+        """add the elements of the backdrop and the HUD"""
+
+        def ovals(surface):
+            pygame.draw.ellipse(surface, (90, 90, 90), (50, self.height - 140, 150, 50))
+            pygame.draw.ellipse(surface, (90, 90, 90), (self.width - 195, 160, 150, 50))
+
+        def menu(surface):
+            menu_rect = pygame.Rect(
+                self.menu_x, self.menu_y, self.menu_width, self.menu_height
             )
+            pygame.draw.rect(surface, (255, 255, 255), menu_rect, 2)
 
-        # draw the results view
-        if self.result == "won":
+        def coins(surface):
             Text(
-                "You won!",
-                "pokemon-hollow",
-                self.width / 2,
-                self.height / 2 - 50,
+                f"Coins: {self.game_view.coins}",
+                "pokemon-solid",
                 100,
-                "red",
-            ).blit_into(self.screen)
-            Text(
-                "Click to return to map!",
-                "pokemon-hollow",
-                self.width / 2,
-                self.height / 2 + 50,
-                50,
-                "white",
-            ).blit_into(self.screen)
-            Text(
-                f"You gained {self.enemy.attributes.xp} XP and {self.coins_to_gain} coins",
-                "pokemon-hollow",
-                self.width / 2,
-                self.height / 2 + 250,
-                20,
-                "white",
-            ).blit_into(self.screen)
-            return
-        if self.result == "lost":
-            Text(
-                "You lost.",
-                "pokemon-hollow",
-                self.width / 2,
-                self.height / 2 - 50,
-                100,
-                "red",
-            ).blit_into(self.screen)
-            Text(
-                "Click to return to map!",
-                "pokemon-hollow",
-                self.width / 2,
-                self.height / 2 + 50,
-                50,
+                62,
+                18,
                 "white",
-            ).blit_into(self.screen)
-            Text(
-                f"You lost {int(self.enemy.attributes.xp // 0.8)} XP",
-                "pokemon-hollow",
-                self.width / 2,
-                self.height / 2 + 250,
-                20,
-                "white",
-            ).blit_into(self.screen)
-            return
-
-        # show coins
-        Text(
-            f"Coins: {self.game_view.coins}",
-            "pokemon-solid",
-            100,
-            62,
-            18,
-            "white",
-        ).blit_into(self.screen)
-
-        # draw ovals
-        pygame.draw.ellipse(self.screen, (90, 90, 90), (50, self.height - 140, 150, 50))
-        pygame.draw.ellipse(self.screen, (90, 90, 90), (self.width - 195, 160, 150, 50))
-
-        # draw the player and the enemy
-        self.player.draw(self.screen, (70, self.height - 320), scale=(128, 212))
-        self.enemy.draw(self.screen, self.width - 170, 100, scale=(96, 96))
+            ).blit_into(surface)
 
-        # draw the health bars and levels
-        HealthBar(self.player).draw(
-            self.screen,
-            (80, self.height - 100),
-            150,
-            20,
-        )
-        HealthBar(self.enemy).draw(self.screen, (self.width - 190, 50), 150, 20)
-
-        # draw the attack menu
-        menu_rect = pygame.Rect(
-            self.menu_x, self.menu_y, self.menu_width, self.menu_height
-        )
-        pygame.draw.rect(self.screen, (255, 255, 255), menu_rect, 2)
+        def health(surface):
+            HealthBar(self.player).draw(
+                surface,
+                (80, self.height - 100),
+                150,
+                20,
+            )
+            HealthBar(self.enemy).draw(surface, (self.width - 190, 50), 150, 20)
 
-        if not self.my_turn:
-            Text(
-                "Waiting for Alien to make a move...",
-                "sans-serif",
-                self.menu_x + self.menu_width // 2,
-                self.menu_y + 20,
-                24,
-                (255, 255, 255),
-            ).blit_into(self.screen)
-        else:
+        def attacks(surface):
+            if not self.my_turn:
+                Text(
+                    "Waiting for Alien to make a move...",
+                    "sans-serif",
+                    self.menu_x + self.menu_width // 2,
+                    self.menu_y + 20,
+                    24,
+                    (255, 255, 255),
+                ).blit_into(surface)
+                return
             Text(
                 "Select an Attack",
                 "sans-serif",
@@ -187,7 +132,7 @@ class Battle(View):
                 self.menu_y + 20,
                 24,
                 (255, 255, 255),
-            ).blit_into(self.screen)
+            ).blit_into(surface)
 
             for i, attack in enumerate(self.player.attacks):
                 row = i // self.num_buttons_per_row
@@ -203,7 +148,7 @@ class Battle(View):
                 button_rect = pygame.Rect(
                     button_x, button_y, self.button_width, self.button_height
                 )
-                pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 2)
+                pygame.draw.rect(surface, (255, 255, 255), button_rect, 2)
                 Text(
                     attack["name"],
                     "sans-serif",
@@ -211,7 +156,7 @@ class Battle(View):
                     button_y + 20,
                     20,
                     (255, 255, 255),
-                ).blit_into(self.screen)
+                ).blit_into(surface)
                 Text(
                     f"Power: {attack['power']}",
                     "sans-serif",
@@ -219,10 +164,11 @@ class Battle(View):
                     button_y + 40,
                     14,
                     (255, 255, 255),
-                ).blit_into(self.screen)
+                ).blit_into(surface)
 
-        # draw current attack info
-        if self.current_attack is not None:
+        def current_attack(surface):
+            if self.current_attack is None:
+                return
             Text(
                 f"{self.current_attack['name']}!",
                 "sans-serif",
@@ -230,7 +176,7 @@ class Battle(View):
                 self.height - 400,
                 30,
                 (255, 255, 255),
-            ).blit_into(self.screen)
+            ).blit_into(surface)
             Text(
                 f"Power: {self.current_attack['power']}",
                 "sans-serif",
@@ -238,7 +184,110 @@ class Battle(View):
                 self.height - 360,
                 20,
                 (255, 255, 255),
-            ).blit_into(self.screen)
+            ).blit_into(surface)
+
+        def result(surface):
+            if self.result == "won":
+                Text(
+                    "You won!",
+                    "pokemon-hollow",
+                    self.width / 2,
+                    self.height / 2 - 50,
+                    100,
+                    "red",
+                ).blit_into(surface)
+                Text(
+                    "Click to return to map!",
+                    "pokemon-hollow",
+                    self.width / 2,
+                    self.height / 2 + 50,
+                    50,
+                    "white",
+                ).blit_into(surface)
+                Text(
+                    f"You gained {self.enemy.attributes.xp} XP and {self.coins_to_gain} coins",
+                    "pokemon-hollow",
+                    self.width / 2,
+                    self.height / 2 + 250,
+                    20,
+                    "white",
+                ).blit_into(surface)
+            elif self.result == "lost":
+                Text(
+                    "You lost.",
+                    "pokemon-hollow",
+                    self.width / 2,
+                    self.height / 2 - 50,
+                    100,
+                    "red",
+                ).blit_into(surface)
+                Text(
+                    "Click to return to map!",
+                    "pokemon-hollow",
+                    self.width / 2,
+                    self.height / 2 + 50,
+                    50,
+                    "white",
+                ).blit_into(surface)
+                Text(
+                    f"You lost {int(self.enemy.attributes.xp // 0.8)} XP",
+                    "pokemon-hollow",
+                    self.width / 2,
+                    self.height / 2 + 250,
+                    20,
+                    "white",
+                ).blit_into(surface)
+
+        self.backdrop.add(ovals)
+        self.hud.add(menu)
+        self.hud.add(coins, lambda: self.game_view.coins)
+        self.hud.add(
+            health,
+            lambda: (
+                self.player.attributes.health,
+                self.player.max_health,
+                self.player.level,
+                self.enemy.attributes.health,
+                self.enemy.max_health,
+            ),
+        )
+        self.hud.add(
+            attacks,
+            lambda: (
+                self.my_turn,
+                tuple((a["name"], a["power"]) for a in self.player.attacks),
+            ),
+        )
+        self.hud.add(
+            current_attack,
+            lambda: self.current_attack and tuple(self.current_attack.values()),
+        )
+        self.results.add(
+            result,
+            lambda: (self.result, self.enemy.attributes.xp, self.coins_to_gain),
+        )
+
+    def on_draw(self) -> None:
+        """Draw the battle view"""
+        if not getattr(self, "game_view"):
+            raise RuntimeError(
+                "Battle was not initiated properly, use PASS_VIEW to pass the Map "
+                "view"
+            )
+
+        # draw the results view
+        if self.result:
+            self.results.draw(self.screen)
+            return
+
+        self.backdrop.draw(self.screen)
+
+        # draw the player and the enemy
+        self.player.draw(self.screen, (70, self.height - 320), scale=(128, 212))
+        self.enemy.draw(self.screen, self.width - 170, 100, scale=(96, 96))
+
+        # coins, health bars, levels and the attack menu
+        self.hud.draw(self.screen)
 
     def on_keydown(self, event) -> None:
         if event.key == pygame.K_ESCAPE:
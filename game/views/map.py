@@ -1,42 +1,100 @@
 """ Implements the Map view, TopDown2D """
-import itertools
+import math
 
 import numpy as np
 import pygame
 
-from game.config import SCREEN_WIDTH, SCREEN_HEIGHT
+from game.config import (
+    MAP_SCROLL_SPEED,
+    MAP_WALK_SPEED,
+    MAP_ZOOM_LEVELS,
+    MINIMAP_SIZE,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
 from game.custom_event import ENEMY_ENCOUNTERED, PASS_VIEW
 from game.data import game_data
 from game.data.states import GameState
-from game.entities.enemy import Enemy
 from game.entities.player import Player
-from game.entities.walls import Wall
 from game.level_gen import Level, LevelState
-from game.utils import Text
+from game.utils import Hud, SpriteBatch, Text
+from game.utils.assets import assets
 from game.utils.bar import HealthBar
+from game.utils.minimap import Minimap
 from game.utils.text import DisapearingText
 from game.views import View, logger
+from game.world import (
+    TILE_FLOOR,
+    TILE_NONE,
+    TILE_PLAYER,
+    TILE_TYPES,
+    ChunkBitset,
+    Layer,
+)
+from game.world.tiles import COLORS, DRAWN
 
 # get logger
 logger.getChild("map")
 
+# (dx, dy) the map moves for each key
+DIRECTIONS = {
+    pygame.K_UP: (0, 1),
+    pygame.K_w: (0, 1),
+    pygame.K_DOWN: (0, -1),
+    pygame.K_s: (0, -1),
+    pygame.K_LEFT: (1, 0),
+    pygame.K_a: (1, 0),
+    pygame.K_RIGHT: (-1, 0),
+    pygame.K_d: (-1, 0),
+}
+# steps taken in a single frame at most, less than the matrix so it still scrolls
+MAX_STEPS_PER_FRAME = 8
+
 
 class Screen:
     """Represents the screen for the map view"""
 
-    screen = {}
-    enemies = {}
-    walls = {}
     level = Level()
     _initiated = False
     regenerate = False
+    # tiles rendered past each edge of the screen, shown while the camera scrolls
+    margin = 1
+    # layers of the tiles on the screen, the margin included
+    tiles = np.zeros((len(Layer), 9 + 2 * margin, 9 + 2 * margin), dtype=np.uint8)
+    # tile id -> its image, None if it isn't drawn
+    images: list[pygame.Surface | None] = []
+    # the tiles rendered off-screen, redrawn only when the screen changes
+    layer: pygame.Surface | None = None
+    # the layer, or the lod, has to be rendered again as a whole
+    dirty = True
+    # (row0, row1, col0, col1) of the tiles, the margin included, to draw again
+    # into the layer, rows and columns 1 exclusive, -1 and 11 stand for the pixels
+    # past the outer tiles
+    stale: list[tuple[int, int, int, int]] = []
+    # tiles the layer scrolled by since it was rendered as a whole, the tiles keep
+    # their pixels relative to each other while it scrolls
+    anchor = (0, 0)
+    # the sprites of the layer, rebuilt when the screen changes
+    batch = SpriteBatch()
+    # camera position relative to the player, eases back to zero after each move
+    offset = pygame.Vector2()
+    tile = pygame.Vector2(SCREEN_WIDTH / 9, SCREEN_HEIGHT / 9)
+    # tiles across the screen, sprites are only drawn at the closest zoom
+    zoom = MAP_ZOOM_LEVELS[0]
+    # the tiles as coloured pixels, used when zoomed out
+    lod: pygame.Surface | None = None
+    # one pixel per tile, scaled up into the lod
+    lod_pixels: pygame.Surface | None = None
+    # what the player has seen around them
+    minimap = Minimap()
 
     @classmethod
     def initiate(cls):
         """initiate the sprites"""
-        for i, j in itertools.product(range(9), range(9)):
-            cls.enemies[(i, j)] = Enemy()
-            cls.walls[(i, j)] = Wall()
+        cls.images = [
+            assets.image(*tile.sprite) if tile.sprite else None for tile in TILE_TYPES
+        ]
+        logger.debug(f" assets: {assets.summary()}")
         cls._initiated = True
         cls.regenerate = True
 
@@ -47,39 +105,377 @@ class Screen:
             cls.clear()
         if level_state:
             cls.clear()
+            cls.minimap.clear()
+            cls.level.simulation.close()
+            cls.level.enemies.clear()
             cls.level.state.reset()
-            cls.level.state.set(level_state.loc, level_state.removed)
+            cls.level.state.set(
+                level_state.loc, level_state.removed, level_state.explored
+            )
+            cls.level.simulation.schedule_removed(cls.level.state.removed)
         if not cls._initiated:
             cls.initiate()
-        map_ = cls.level.generate()
-        for idx, x in np.ndenumerate(map_):
-            match chr(x):
-                case "w":
-                    cls.screen[idx] = cls.walls[idx]
-                case "e":
-                    cls.screen[idx] = cls.enemies[idx]
+        cls.dirty = True
+        cls.level.generate()
+        cls._map_tiles(slice(0, 9), slice(0, 9))
+        cls._map_border()
+        cls._update_minimap([(slice(0, 9), slice(0, 9))])
 
     @classmethod
-    def move(cls, dx, dy):
-        """move the map in 2D"""
-        # move the level
+    def _map_tiles(cls, rows: slice, cols: slice, tiles=None):
+        """copy the layers of a region of the level, or `tiles`, to the screen"""
+        if tiles is None:
+            tiles = cls.level.tiles[:, rows, cols]
+        m = cls.margin
+        row, col = rows.start + m, cols.start + m
+        target = cls.tiles[:, row : rows.stop + m, col : cols.stop + m]
+        changed = (target != tiles).any(axis=0)
+        if changed.any():
+            target[...] = tiles
+            # only the tiles that changed are drawn again
+            ys, xs = np.nonzero(changed)
+            cls.stale.append(
+                (row + ys.min(), row + ys.max() + 1, col + xs.min(), col + xs.max() + 1)
+            )
+
+    @classmethod
+    def scroll(cls):
+        """shift the screen along with the level, map only the newly exposed tiles"""
+        shift, regions = cls.level.scroll()
+        if shift is None:
+            cls.clear()
+        elif any(shift):
+            dy, dx = shift
+            # what wraps around is newly exposed and mapped again below
+            cls.tiles = np.roll(cls.tiles, shift, axis=(1, 2))
+            if cls.zoom == MAP_ZOOM_LEVELS[0]:
+                cls._scroll_layer(dy, dx)
+            else:
+                cls._scroll_lod(dy, dx)
+            # keep drawing the tiles where they were, the camera catches up
+            cls.offset -= (dx * cls.tile.x, dy * cls.tile.y)
+            limit = cls.tile * cls.margin
+            cls.offset.update(
+                max(-limit.x, min(cls.offset.x, limit.x)),
+                max(-limit.y, min(cls.offset.y, limit.y)),
+            )
+        for rows, cols in regions:
+            cls._map_tiles(rows, cols)
+        if regions:
+            cls._map_border()
+            cls._update_minimap(regions)
+
+    @classmethod
+    def _scroll_layer(cls, dy: int, dx: int):
+        """scroll the rendered layer along with the tiles, the wrapped ones are stale"""
+        if cls.dirty or cls.layer is None:
+            return
+        ax, ay = cls.anchor
+        cls.anchor = (ax - dx, ay - dy)
+        cls.layer.scroll(
+            math.floor(ax * cls.tile.x) - math.floor((ax - dx) * cls.tile.x),
+            math.floor(ay * cls.tile.y) - math.floor((ay - dy) * cls.tile.y),
+        )
+        n = cls.tiles.shape[1]
+        cls.stale = [
+            (r0 + dy, r1 + dy, c0 + dx, c1 + dx) for r0, r1, c0, c1 in cls.stale
+        ]
+        # the pixels past the tiles on the other side are too, a tile that scrolled
+        # off reached into them, -1 and n stand for those
+        if dy:
+            cls.stale.append((0, dy, 0, n) if dy > 0 else (n + dy, n, 0, n))
+            cls.stale.append((n, n + 1, 0, n) if dy > 0 else (-1, 0, 0, n))
+        if dx:
+            cls.stale.append((0, n, 0, dx) if dx > 0 else (0, n, n + dx, n))
+            cls.stale.append((0, n, n, n + 1) if dx > 0 else (0, n, -1, 0))
+
+    @classmethod
+    def _scroll_lod(cls, dy: int, dx: int):
+        """scroll the pixels of the lod along with the tiles, paint the exposed ones"""
+        if cls.dirty or cls.lod_pixels is None:
+            return
+        radius = cls.zoom // 2 + cls.margin
+        size = 2 * radius + 1
+        cls.lod_pixels.scroll(dx, dy)
+        # (row0, row1, col0, col1) of the pixels to paint, the player moved off the
+        # middle one
+        regions = [(radius + dy, radius + dy + 1, radius + dx, radius + dx + 1)]
+        if dy:
+            regions.append((0, dy, 0, size) if dy > 0 else (size + dy, size, 0, size))
+        if dx:
+            regions.append((0, size, 0, dx) if dx > 0 else (0, size, size + dx, size))
+        cls._paint_lod(regions)
+        cls.lod = pygame.transform.scale(cls.lod_pixels, cls.lod.get_size())
+
+    @classmethod
+    def _paint_lod(cls, regions: list[tuple[int, int, int, int]]):
+        """paint (row0, row1, col0, col1) regions of the lod pixels, and the player"""
+        radius = cls.zoom // 2 + cls.margin
+        px, py = cls.level.player_pos
+        # surfarray is indexed [x, y]
+        pixels = pygame.surfarray.pixels3d(cls.lod_pixels)
+        for r0, r1, c0, c1 in regions:
+            # oriented like the matrix, the pixels run against the world axes
+            x0, y0 = px + radius - c1 + 1, py + radius - r1 + 1
+            tiles = cls.level.region(x0, y0, x0 + c1 - c0, y0 + r1 - r0)[::-1, ::-1]
+            pixels[c0:c1, r0:r1] = COLORS[tiles].transpose(1, 0, 2)
+        pixels[radius, radius] = COLORS[TILE_PLAYER]
+
+    @classmethod
+    def _update_minimap(cls, regions: list[tuple[slice, slice]]):
+        """follow the player on the minimap and paint the regions that changed"""
+        top = cls.level.matrix
+        # the minimap marks the player itself
+        top[4, 4] = cls.level.tiles[Layer.TERRAIN, 4, 4]
+        cls.minimap.update(
+            cls.level.player_pos,
+            [(rows, cols, top[rows, cols]) for rows, cols in regions],
+            cls._explored_region,
+        )
+
+    @classmethod
+    def _explored_region(cls, x0: int, y0: int, x1: int, y1: int):
+        """the tiles of a rectangle of the world and which of them were explored"""
+        return (
+            cls.level.region(x0, y0, x1, y1),
+            cls.level.state.explored.mask(x0, y0, x1, y1),
+        )
+
+    @classmethod
+    def _map_border(cls):
+        """map the tiles past the edges of the level matrix"""
+        for rows, cols, tiles in cls.level.border(cls.margin):
+            cls._map_tiles(rows, cols, tiles)
+
+    @classmethod
+    def update_camera(cls, dt: float, speed: float):
+        """
+        Ease the camera towards the player
+
+        :param dt: seconds since the last frame
+        :param speed: tiles per second
+        """
+        if not cls.offset:
+            return
+        step = cls.tile * speed * dt
+        cls.offset.update(
+            max(0.0, abs(cls.offset.x) - step.x) * np.sign(cls.offset.x),
+            max(0.0, abs(cls.offset.y) - step.y) * np.sign(cls.offset.y),
+        )
 
-        if cls.level.move(dx, dy):
+    @classmethod
+    def move(cls, dx, dy) -> bool:
+        """move the map in 2D, False if the player couldn't move"""
+        return cls.walk([(dx, dy)]) == 1
+
+    @classmethod
+    def walk(cls, steps: list[tuple[int, int]]) -> int:
+        """
+        Move the map a few steps, the screen is updated once for all of them
+
+        :param steps: (dx, dy) of each step, each one is checked for collisions and
+            encounters
+        :return: the steps taken, up to the first one that was blocked
+        """
+        taken = 0
+        # move the level
+        for dx, dy in steps:
+            if not cls.level.move(dx, dy):
+                break
+            taken += 1
+        if taken:
             logger.debug(str(cls.level.state))
-            cls.regenerate = True
-            # update the screen
-            cls.load()
+        # update the screen, a blocked step may still have moved the level back
+        # from where its ghost went
+        cls.scroll()
+        return taken
+
+    @classmethod
+    def tile_at(cls, pos) -> tuple[int, int]:
+        """absolute position of the tile under a point of the screen"""
+        scale = 9 / cls.zoom
+        # the tiles around the player, as drawn by draw, the player in the middle
+        radius = cls.zoom // 2 + cls.margin
+        top_left = (cls.offset - cls.tile * cls.margin) * scale
+        col = int((pos[0] - top_left.x) // (cls.tile.x * scale)) - radius
+        row = int((pos[1] - top_left.y) // (cls.tile.y * scale)) - radius
+        # the screen runs against the world axes
+        x, y = cls.level.player_pos
+        return x - col, y - row
+
+    @classmethod
+    def simulate(cls):
+        """step the world, update the parts of the screen that changed"""
+        regenerate, cells = cls.level.simulate(cls.zoom // 2 + cls.margin)
+        if regenerate:
+            cls.scroll()
+        elif len(cells):
+            cls._repaint(cells)
+
+    @classmethod
+    def _repaint(cls, cells: np.ndarray):
+        """
+        Map single tiles that changed, without regenerating the screen
+
+        :param cells: absolute (x, y) of the tiles
+        """
+        regions = []
+        for rows, cols, layers in cls.level.refresh(cells, cls.margin):
+            cls._map_tiles(rows, cols, layers)
+            if 0 <= rows.start < 9 and 0 <= cols.start < 9:
+                regions.append((rows, cols))
+        if regions:
+            cls._update_minimap(regions)
+        if cls.zoom != MAP_ZOOM_LEVELS[0] and not cls.dirty and cls.lod is not None:
+            # paint the pixels of the tiles, instead of rendering every tile again
+            radius = cls.zoom // 2 + cls.margin
+            px, py = cls.level.player_pos
+            for x, y in cells.tolist():
+                # oriented like the matrix, as rendered by render_lod
+                i, j = py + radius - y, px + radius - x
+                if 0 <= i <= 2 * radius and 0 <= j <= 2 * radius:
+                    cls.lod_pixels.set_at((j, i), COLORS[cls.level.tile(x, y)])
+            cls.lod = pygame.transform.scale(cls.lod_pixels, cls.lod.get_size())
 
     @classmethod
     def clear(cls):
         """clear the screen"""
-        cls.screen.clear()
+        cls.tiles[Layer.TERRAIN] = TILE_FLOOR
+        cls.tiles[Layer.OBJECT] = TILE_NONE
+        cls.dirty = True
 
     @classmethod
-    def draw(cls, screen):
-        """draw the screen"""
-        for idx, sprite in cls.screen.items():
-            sprite.draw(screen, idx[1] * SCREEN_WIDTH / 9, idx[0] * SCREEN_HEIGHT / 9)
+    def _grid(cls) -> tuple[list[int], list[int]]:
+        """left of the columns and top of the rows of tiles in the layer, the margin
+        included, and where the last ones end"""
+        ax, ay = cls.anchor
+        m, n = cls.margin, cls.tiles.shape[1]
+        tx, ty = cls.tile
+        return (
+            [
+                math.floor((ax + col - m) * tx)
+                - math.floor(ax * tx)
+                + math.ceil(tx * m)
+                for col in range(n + 1)
+            ],
+            [
+                math.floor((ay + row - m) * ty)
+                - math.floor(ay * ty)
+                + math.ceil(ty * m)
+                for row in range(n + 1)
+            ],
+        )
+
+    @classmethod
+    def _draw_tiles(cls, rows: slice, cols: slice, grid: tuple[list[int], list[int]]):
+        """draw a region of the tiles into the layer, terrain first"""
+        left, top = grid
+        cls.batch.clear()
+        for tiles in cls.tiles[:, rows, cols]:
+            ys, xs = np.nonzero(DRAWN[tiles])
+            for i, j, tile_id in zip(ys.tolist(), xs.tolist(), tiles[ys, xs].tolist()):
+                cls.batch.add(
+                    cls.images[tile_id], (left[cols.start + j], top[rows.start + i])
+                )
+        cls.batch.draw(cls.layer)
+
+    @classmethod
+    def _render_region(
+        cls,
+        region: tuple[int, int, int, int],
+        background,
+        grid: tuple[list[int], list[int]],
+    ):
+        """render a (row0, row1, col0, col1) region of tiles again into the layer"""
+        n = cls.tiles.shape[1]
+        r0, r1, c0, c1 = region
+        r0, r1, c0, c1 = max(r0, -1), min(r1, n + 1), max(c0, -1), min(c1, n + 1)
+        left, top = grid
+        if r0 >= r1 or c0 >= c1:
+            return
+        # the pixels of the region and the pixel its tiles reach past it, up to the
+        # layer edges on the outer tiles
+        x, y = (left[c0] if c0 > 0 else 0), (top[r0] if r0 > 0 else 0)
+        clip = pygame.Rect(
+            x,
+            y,
+            (left[c1] + 1 if c1 < n else cls.layer.get_width()) - x,
+            (top[r1] + 1 if r1 < n else cls.layer.get_height()) - y,
+        )
+        cls.layer.set_clip(clip)
+        cls.layer.fill(background, clip)
+        # as well as the tiles around it that reach into those pixels
+        cls._draw_tiles(
+            slice(max(r0 - 1, 0), min(r1 + 1, n)),
+            slice(max(c0 - 1, 0), min(c1 + 1, n)),
+            grid,
+        )
+        cls.layer.set_clip(None)
+
+    @classmethod
+    def render(cls, background):
+        """render the tiles, and the margin around them, into the layer"""
+        if cls.layer is None:
+            size = cls.tile * 9 + cls._origin() * 2
+            cls.layer = pygame.Surface((round(size.x), round(size.y))).convert()
+            cls.dirty = True
+        n = cls.tiles.shape[1]
+        grid = cls._grid()
+        if cls.dirty:
+            cls.layer.fill(background)
+            cls._draw_tiles(slice(0, n), slice(0, n), grid)
+        for region in cls.stale:
+            if not cls.dirty:
+                cls._render_region(region, background, grid)
+        cls.stale.clear()
+        cls.dirty = False
+
+    @classmethod
+    def render_lod(cls):
+        """render one colour per tile around the player and scale it to the screen"""
+        radius = cls.zoom // 2 + cls.margin
+        colors = COLORS[cls.level.around(radius)]
+        # surfarray is indexed [x, y]
+        cls.lod_pixels = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))
+        size = cls.tile * 9 / cls.zoom * (2 * radius + 1)
+        cls.lod = pygame.transform.scale(cls.lod_pixels, (round(size.x), round(size.y)))
+        cls.dirty = False
+
+    @classmethod
+    def set_zoom(cls, zoom: int):
+        """change the number of tiles across the screen"""
+        if zoom != cls.zoom:
+            cls.zoom = zoom
+            cls.dirty = True
+
+    @classmethod
+    def _origin(cls) -> pygame.Vector2:
+        """position of the top left tile of the screen in the layer"""
+        return pygame.Vector2(
+            np.ceil(cls.tile.x * cls.margin), np.ceil(cls.tile.y * cls.margin)
+        )
+
+    @classmethod
+    def draw(cls, screen, background="black"):
+        """draw the screen, the tiles are only rendered again if they changed"""
+        if cls.zoom != MAP_ZOOM_LEVELS[0]:
+            if cls.dirty or cls.lod is None:
+                cls.render_lod()
+            scale = 9 / cls.zoom
+            screen.blit(cls.lod, (cls.offset - cls.tile * cls.margin) * scale)
+            # the layer is rendered as a whole when zooming back in
+            cls.stale.clear()
+            return
+        if cls.dirty or cls.stale or cls.layer is None:
+            cls.render(background)
+        # the player's tile stays where it is on a layer that was never scrolled
+        left, top = cls._grid()
+        x, y = left[cls.margin + 4], top[cls.margin + 4]
+        screen.blit(
+            cls.layer,
+            cls.offset
+            - (x - math.floor(4 * cls.tile.x), y - math.floor(4 * cls.tile.y)),
+        )
 
 
 class Map(View):
@@ -92,7 +488,12 @@ class Map(View):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.speed = 5
+        # tiles per second the camera scrolls
+        self.speed = MAP_SCROLL_SPEED
+
+        # (dx, dy) moves left of a walk along a path, and seconds to the next one
+        self.route: list[tuple[int, int]] = []
+        self._walk_timer = 0.0
 
         # to be used for battle view
         self.enemy_pos = None
@@ -107,26 +508,63 @@ class Map(View):
             time=2000,
         )
 
-    def on_draw(self):
-        scale = (64, 96) if self.player.scale != (64, 96) else None
-        self.screen_map.draw(self.screen)
-        self.player.draw(self.screen, scale=scale)
-
-        # visuals
-        pygame.draw.rect(self.screen, (5, 5, 5), (0, 0, self.width, 60))
-        pygame.draw.line(self.screen, "white", (0, 60), (self.width, 60))
-        pygame.draw.rect(
-            self.screen, (5, 5, 5), (0, self.height - 50, self.width, self.height)
-        )
-        pygame.draw.line(
-            self.screen, "white", (0, self.height - 50), (self.width, self.height - 50)
-        )
+        # the bars, instructions, health, level and coins
+        self.hud = Hud(self.size)
+        self._build_hud()
+
+    def _build_hud(self):
+        """add the elements of the HUD"""
+
+        def bars(surface):
+            pygame.draw.rect(surface, (5, 5, 5), (0, 0, self.width, 60))
+            pygame.draw.line(surface, "white", (0, 60), (self.width, 60))
+            pygame.draw.rect(
+                surface, (5, 5, 5), (0, self.height - 50, self.width, self.height)
+            )
+            pygame.draw.line(
+                surface, "white", (0, self.height - 50), (self.width, self.height - 50)
+            )
+
+        def minimap_frame(surface):
+            pygame.draw.rect(
+                surface, "white", self._minimap_rect().inflate(4, 4), 1, border_radius=2
+            )
+
+        def instructions(surface):
+            Text(
+                "Use W, A, S, D buttons or arrow buttons to move Up, Left, Down and "
+                "Right respectively",
+                "pokemon-solid",
+                self.width / 2,
+                self.height - 25,
+                13,
+                "white",
+            ).blit_into(surface)
+            Text(
+                "Press escape to Pause",
+                "pokemon-solid",
+                self.width - 95,
+                self.height - 63,
+                15,
+                "white",
+            ).blit_into(surface)
 
-        # draw the health bar and level
-        HealthBar(self.player).draw(self.screen, (self.width - 170, 20), 150, 20)
+        def health(surface):
+            HealthBar(self.player).draw(surface, (self.width - 170, 20), 150, 20)
 
-        # ghost stuff
-        if self.player.attributes.health <= 0:
+        def coins(surface):
+            Text(
+                f"Coins: {self.coins}",
+                "pokemon-solid",
+                100,
+                33,
+                18,
+                "white",
+            ).blit_into(surface)
+
+        def ghost(surface):
+            if self.player.attributes.health > 0:
+                return
             Text(
                 "You've become a ghost!",
                 "pokemon-solid",
@@ -134,7 +572,7 @@ class Map(View):
                 self.height / 2 - 100,
                 25,
                 "white",
-            ).blit_into(self.screen)
+            ).blit_into(surface)
             Text(
                 "Drink a potion to revive or start a new game.",
                 "pokemon-solid",
@@ -142,7 +580,35 @@ class Map(View):
                 self.height / 2 + 23 - 100,
                 25,
                 "white",
-            ).blit_into(self.screen)
+            ).blit_into(surface)
+
+        self.hud.add(bars)
+        self.hud.add(minimap_frame)
+        self.hud.add(instructions)
+        self.hud.add(
+            health,
+            lambda: (
+                self.player.attributes.health,
+                self.player.max_health,
+                self.player.level,
+            ),
+        )
+        self.hud.add(coins, lambda: self.coins)
+        self.hud.add(ghost, lambda: self.player.attributes.health <= 0)
+
+    def on_draw(self):
+        scale = (64, 96) if self.player.scale != (64, 96) else None
+        self.screen_map.draw(self.screen, self.bg_color)
+        # zoomed out, the player is a pixel of the map
+        if self.screen_map.zoom == MAP_ZOOM_LEVELS[0]:
+            self.player.draw(self.screen, scale=scale)
+
+        # visuals, health, level and coins
+        self.hud.draw(self.screen)
+        self.screen_map.minimap.draw(self.screen, self._minimap_rect())
+
+        # ghost stuff
+        if self.player.attributes.health <= 0:
             game_data.save_temp(True, "ghost")
         elif game_data.get_temp("ghost"):
             game_data.save_temp(False, "ghost")
@@ -152,43 +618,72 @@ class Map(View):
             if not self.alert1.visible:
                 game_data.save_temp(False, "GHOST_SAVE")
 
-        # instructions
-        Text(
-            "Use W, A, S, D buttons or arrow buttons to move Up, Left, Down and Right respectively",
-            "pokemon-solid",
-            self.width / 2,
-            self.height - 25,
-            13,
-            "white",
-        ).blit_into(self.screen)
-        Text(
-            "Press escape to Pause",
-            "pokemon-solid",
-            self.width - 95,
-            self.height - 63,
-            15,
-            "white",
-        ).blit_into(self.screen)
-        # show coins
-        Text(
-            f"Coins: {self.coins}",
-            "pokemon-solid",
-            100,
-            33,
-            18,
-            "white",
-        ).blit_into(self.screen)
+    def _minimap_rect(self) -> pygame.Rect:
+        """where the minimap goes, in the middle of the top bar"""
+        rect = pygame.Rect((0, 0), MINIMAP_SIZE)
+        rect.center = (self.width / 2, 30)
+        return rect
+
+    def on_update(self):
+        # merge the simulation of the chunks around the player, step the enemies
+        self.screen_map.simulate()
+        # an enemy that reached the player fights it where it stands, the battle
+        # looks the enemy up relative to the player
+        if not (e := ENEMY_ENCOUNTERED.get()):
+            self._walk(self._clock.get_time() / 1000)
+            e = ENEMY_ENCOUNTERED.get()
+        if e:
+            self._on_enemy_encounter(e)
+        self.screen_map.update_camera(self._clock.get_time() / 1000, self.speed)
+
+    def _walk(self, dt: float):
+        """take the steps due since the last frame, a held key first, then the route"""
+        if ENEMY_ENCOUNTERED.peek():
+            # the battle looks the enemy up relative to where the player stands
+            return
+        held = pygame.key.get_pressed()
+        direction = next((d for key, d in DIRECTIONS.items() if held[key]), None)
+        if direction is None and not self.route:
+            self._walk_timer = 0.0
+            return
+        self._walk_timer -= dt
+        steps = []
+        while self._walk_timer <= 0 and len(steps) < MAX_STEPS_PER_FRAME:
+            self._walk_timer += 1 / MAP_WALK_SPEED
+            if direction is not None:
+                steps.append(direction)
+            elif self.route:
+                steps.append(self.route.pop(0))
+        # don't catch up on steps missed while the game was busy
+        self._walk_timer = max(self._walk_timer, 0.0)
+        # one update of the world and the screen for all the steps
+        if steps and self.screen_map.walk(steps) < len(steps):
+            # something got in the way
+            self.route.clear()
+
+    def on_click(self, event):
+        if event.button != "left":
+            return
+        # walk to the clicked tile
+        self.route = self.screen_map.level.route_to(self.screen_map.tile_at(event.pos))
+        self._walk_timer = 0.0
 
     def on_keydown(self, event):
+        # the keys take over from any walk
+        self.route.clear()
+        if direction := DIRECTIONS.get(event.key):
+            self.screen_map.move(*direction)
+            # keep moving if the key is held
+            self._walk_timer = 1 / MAP_WALK_SPEED
         match event.key:
-            case pygame.K_UP | pygame.K_w:
-                self.screen_map.move(0, 1)
-            case pygame.K_DOWN | pygame.K_s:
-                self.screen_map.move(0, -1)
-            case pygame.K_LEFT | pygame.K_a:
-                self.screen_map.move(1, 0)
-            case pygame.K_RIGHT | pygame.K_d:
-                self.screen_map.move(-1, 0)
+            case pygame.K_EQUALS | pygame.K_PLUS | pygame.K_KP_PLUS:
+                self.zoom(-1)
+            case pygame.K_MINUS | pygame.K_KP_MINUS:
+                self.zoom(1)
+            case pygame.K_n:
+                # walk to the closest enemy
+                self.route = self.screen_map.level.route_to_enemy()
+                self._walk_timer = 0.0
             case pygame.K_ESCAPE:
                 # needed for saving game from a different view
                 self.save_data(temp=True)
@@ -199,10 +694,20 @@ class Map(View):
         if e := ENEMY_ENCOUNTERED.get():
             self._on_enemy_encounter(e)
 
+    def on_scroll(self, event):
+        self.zoom(-1 if event.mode == "up" else 1)
+
+    def zoom(self, step: int):
+        """zoom out by `step` zoom levels, in if negative"""
+        level = MAP_ZOOM_LEVELS.index(self.screen_map.zoom) + step
+        level = max(0, min(level, len(MAP_ZOOM_LEVELS) - 1))
+        self.screen_map.set_zoom(MAP_ZOOM_LEVELS[level])
+
     def _on_enemy_encounter(self, event):
         """called when enemy is encountered"""
         # get enemy position
         self.enemy_pos = event.pos
+        self.route.clear()
         logger.debug(" enemy encountered!")
         PASS_VIEW.post({"view": self})
         # needed for saving game from a different view
@@ -235,21 +740,32 @@ class Map(View):
         logger.debug(" loading data")
         game_data.load(state_index)
 
-        # clear screen and set level state
-        self.screen_map.load(LevelState(game_data.get("loc"), game_data.get("removed")))
+        # clear screen and set level state, on copies so the slot stays as saved
+        self.screen_map.load(
+            LevelState(
+                game_data.get("loc"),
+                game_data.get("removed").copy(),
+                game_data.get("explored").copy(),
+            )
+        )
         self.player.attributes.health = game_data.get("health")
         self.player.attributes.xp = game_data.get("xp")
         self.coins = game_data.get("coins")
         # redraw
         self.on_draw()
 
+    def exit(self):
+        # stop the background work of the level before the display goes
+        self.screen_map.level.close()
+        super().exit()
+
     def pre_run(self, _spl_args):
         # ghost mode off
         game_data.save_temp(False, "ghost")
         game_data.save_temp(False, "GHOST_SAVE")
         if _spl_args:
             if "reset" in _spl_args:
-                self.screen_map.load(LevelState([0, 0], set()))
+                self.screen_map.load(LevelState([0, 0], ChunkBitset()))
                 self.coins = 0
                 # new player
                 self.player = Player()
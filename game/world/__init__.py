@@ -0,0 +1,46 @@
+""" Procedural world engine used by the level generator """
+
+from .bitset import ChunkBitset
+from .chunks import ChunkCache, chunk_slices
+from .generate import BIOMES, biome_field, generate_block, tile_hash
+from .pathfinding import Pathfinder
+from .prefetch import Prefetcher
+from .roaming import Roam, RoamingEnemies
+from .simulation import ChunkSimulation
+from .tiles import (
+    TILE_ENEMY,
+    TILE_FLOOR,
+    TILE_NONE,
+    TILE_PLAYER,
+    TILE_TYPES,
+    TILE_WALL,
+    Layer,
+    TileType,
+    register_tile,
+    split_layers,
+)
+
+__all__ = [
+    "BIOMES",
+    "ChunkBitset",
+    "ChunkCache",
+    "ChunkSimulation",
+    "Layer",
+    "Pathfinder",
+    "Prefetcher",
+    "Roam",
+    "RoamingEnemies",
+    "TILE_ENEMY",
+    "TILE_FLOOR",
+    "TILE_NONE",
+    "TILE_PLAYER",
+    "TILE_TYPES",
+    "TILE_WALL",
+    "TileType",
+    "biome_field",
+    "chunk_slices",
+    "generate_block",
+    "register_tile",
+    "split_layers",
+    "tile_hash",
+]
@@ -0,0 +1,126 @@
+"""Bake a region of the world into a file and read it back through a memory map"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.common_types import AnyPath
+from game.config import BIOME_SCALE, CHUNK_SIZE, WORLD_SEED
+from game.logger import logger
+from game.world.generate import BIOMES, SPAWN_TABLE, generate_block
+from game.world.tiles import TILE_TYPES
+
+logger = logger.getChild("world.atlas")
+
+# rows generated per pass while baking, bounds the memory used
+_BAKE_ROWS = 256
+# bump when generate_block changes in a way the tables it reads don't show
+_GENERATOR_VERSION = 1
+
+
+def generator_fingerprint() -> str:
+    """hash of everything the generated tiles depend on besides the seed"""
+    generator = (_GENERATOR_VERSION, BIOMES, SPAWN_TABLE, BIOME_SCALE, CHUNK_SIZE)
+    return hashlib.sha1(repr(generator).encode()).hexdigest()
+
+
+def _meta_path(path: AnyPath) -> Path:
+    """get the path of the json index stored next to the atlas"""
+    return Path(path).with_suffix(".json")
+
+
+def bake_atlas(path: AnyPath, seed: int, x0: int, y0: int, x1: int, y1: int):
+    """
+    Generate a rectangle of the world into a uint8 .npy file
+
+    :param path: destination .npy file, an index is written next to it as .json
+    :param seed: world seed
+    :param x0: first absolute x, inclusive
+    :param y0: first absolute y, inclusive
+    :param x1: last absolute x, exclusive
+    :param y1: last absolute y, exclusive
+    """
+    width, height = x1 - x0, y1 - y0
+    logger.debug(f"baking {width}x{height} tiles of seed {seed} into {path}")
+    tiles = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.uint8, shape=(height, width)
+    )
+    for top in range(0, height, _BAKE_ROWS):
+        rows = min(_BAKE_ROWS, height - top)
+        tiles[top : top + rows] = generate_block(seed, x0, y0 + top, width, rows)
+    tiles.flush()
+    del tiles
+    with open(_meta_path(path), "w+", encoding="utf-8") as f:
+        json.dump(
+            {
+                "seed": seed,
+                "x0": x0,
+                "y0": y0,
+                "x1": x1,
+                "y1": y1,
+                "tiles": [tile.name for tile in TILE_TYPES],
+                "generator": generator_fingerprint(),
+            },
+            f,
+        )
+
+
+class WorldAtlas:
+    """A baked region of the world, shared between processes by the page cache"""
+
+    def __init__(self, path: AnyPath):
+        """
+        Open a baked atlas
+
+        :param path: the .npy file written by bake_atlas
+        """
+        with open(_meta_path(path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.seed = meta["seed"]
+        self.x0, self.y0, self.x1, self.y1 = (meta[k] for k in ("x0", "y0", "x1", "y1"))
+        # names of the tile ids it was baked with
+        self.tile_names = meta.get("tiles", [])
+        # fingerprint of the generator it was baked with
+        self.generator = meta.get("generator")
+        self.tiles = np.load(path, mmap_mode="r")
+
+    def matches(self) -> bool:
+        """check if it was baked with the tile types and the generator used now"""
+        return (
+            self.tile_names == [tile.name for tile in TILE_TYPES]
+            and self.generator == generator_fingerprint()
+        )
+
+    def covers(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """check if a rectangle lies completely inside the baked bounds"""
+        return self.x0 <= x0 and self.y0 <= y0 and x1 <= self.x1 and y1 <= self.y1
+
+    def read(self, x0: int, y0: int, x1: int, y1: int) -> NDArray:
+        """
+        Read a rectangle of tiles without copying it, it must be covered
+
+        :return: read-only uint8 array of tile ids indexed [y - y0, x - x0]
+        """
+        return self.tiles[y0 - self.y0 : y1 - self.y0, x0 - self.x0 : x1 - self.x0]
+
+
+def main():
+    """Command line entry point to bake an atlas"""
+
+    parser = argparse.ArgumentParser(description="Bake a region of the world")
+    parser.add_argument("path", help="destination .npy file")
+    parser.add_argument("--seed", type=int, default=WORLD_SEED)
+    parser.add_argument("--x0", type=int, default=-2048)
+    parser.add_argument("--y0", type=int, default=-2048)
+    parser.add_argument("--x1", type=int, default=2048)
+    parser.add_argument("--y1", type=int, default=2048)
+    args = parser.parse_args()
+    bake_atlas(args.path, args.seed, args.x0, args.y0, args.x1, args.y1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Compact sets of world positions"""
+
+import base64
+import itertools
+from collections.abc import Iterable, Iterator, MutableSet
+from typing import Self
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.config import CHUNK_SIZE
+from game.world.chunks import chunk_slices
+
+
+class ChunkBitset(MutableSet):
+    """A set of absolute (x, y) positions stored as one bitmap per chunk"""
+
+    # shared by every set, no two states of any two sets have the same version
+    _versions = itertools.count()
+
+    def __init__(self, positions: Iterable = (), chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the set
+
+        :param positions: (x, y) positions to add
+        :param chunk_size: tiles per side of a chunk, chunk_size**2 must be a
+            multiple of 8
+        """
+        self.chunk_size = chunk_size
+        self._bitmaps: dict[tuple[int, int], bytearray] = {}
+        self._len = 0
+        # changes whenever the set does, for caches of anything derived from it
+        self.version = next(self._versions)
+        for pos in positions:
+            self.add(pos)
+
+    def _locate(self, pos) -> tuple[tuple[int, int], int, int]:
+        """get the chunk key, byte and bit mask for a position"""
+        x, y = pos
+        size = self.chunk_size
+        idx = (y % size) * size + x % size
+        return (x // size, y // size), idx >> 3, 1 << (idx & 7)
+
+    def __contains__(self, pos) -> bool:
+        key, byte, bit = self._locate(pos)
+        bitmap = self._bitmaps.get(key)
+        return bitmap is not None and bool(bitmap[byte] & bit)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        size = self.chunk_size
+        for (cx, cy), bitmap in self._bitmaps.items():
+            bits = np.unpackbits(np.frombuffer(bitmap, np.uint8), bitorder="little")
+            for idx in np.flatnonzero(bits).tolist():
+                yield cx * size + idx % size, cy * size + idx // size
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"<ChunkBitset: {self._len} positions in {len(self._bitmaps)} chunks>"
+
+    def add(self, value) -> None:
+        key, byte, bit = self._locate(value)
+        if (bitmap := self._bitmaps.get(key)) is None:
+            bitmap = self._bitmaps[key] = bytearray(self.chunk_size**2 // 8)
+        if not bitmap[byte] & bit:
+            bitmap[byte] |= bit
+            self._len += 1
+            self.version = next(self._versions)
+
+    def discard(self, value) -> None:
+        key, byte, bit = self._locate(value)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is not None and bitmap[byte] & bit:
+            bitmap[byte] &= ~bit
+            self._len -= 1
+            self.version = next(self._versions)
+            if not any(bitmap):
+                del self._bitmaps[key]
+
+    def add_mask(self, x0: int, y0: int, mask: NDArray) -> None:
+        """
+        Add the positions of a rectangle of the world in bulk
+
+        :param x0: absolute x of the first column
+        :param y0: absolute y of the first row
+        :param mask: bool array indexed [y - y0, x - x0], True for the positions to add
+        """
+        height, width = mask.shape
+        size = self.chunk_size
+        for key, dst, src in chunk_slices(x0, y0, x0 + width, y0 + height, size):
+            if not (part := mask[dst]).any():
+                continue
+            bits = self.chunk_mask(key)
+            bits = np.zeros((size, size), dtype=bool) if bits is None else bits.copy()
+            before = np.count_nonzero(bits)
+            bits[src] |= part
+            self._bitmaps[key] = bytearray(np.packbits(bits, bitorder="little"))
+            self._len += np.count_nonzero(bits) - before
+            self.version = next(self._versions)
+
+    def add_rect(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """add every position of a rectangle of the world, x1 and y1 exclusive"""
+        self.add_mask(x0, y0, np.ones((y1 - y0, x1 - x0), dtype=bool))
+
+    def to_list(self) -> list[list]:
+        """
+        Serialize the set, a few bits per position no matter how many there are
+
+        :return: [chunk x, chunk y, base64 bitmap] of every chunk, JSON friendly
+        """
+        return [
+            [cx, cy, base64.b64encode(bitmap).decode("ascii")]
+            for (cx, cy), bitmap in self._bitmaps.items()
+        ]
+
+    @classmethod
+    def from_list(cls, chunks: list[list], chunk_size: int = CHUNK_SIZE) -> Self:
+        """
+        Deserialize a set written by to_list
+
+        :param chunks: the output of to_list
+        :param chunk_size: tiles per side of a chunk, as it was serialized with
+        """
+        bitset = cls(chunk_size=chunk_size)
+        for cx, cy, data in chunks:
+            bitmap = bytearray(base64.b64decode(data))
+            if len(bitmap) != chunk_size**2 // 8:
+                raise ValueError(f"chunk {(cx, cy)}: bitmap of the wrong size")
+            bitset._bitmaps[(cx, cy)] = bitmap
+            bitset._len += int.from_bytes(bitmap, "little").bit_count()
+        return bitset
+
+    def copy(self) -> Self:
+        """an independent set with the same positions, the bitmaps are copied"""
+        # pylint: disable=protected-access
+        bitset = ChunkBitset(chunk_size=self.chunk_size)
+        bitset._bitmaps = {key: bitmap.copy() for key, bitmap in self._bitmaps.items()}
+        bitset._len = self._len
+        return bitset
+
+    def chunk_keys(self) -> list[tuple[int, int]]:
+        """get the keys of the chunks that hold any positions"""
+        return list(self._bitmaps)
+
+    def chunk_mask(self, key: tuple[int, int]) -> NDArray | None:
+        """get the bitmap of a chunk as a bool array indexed [y, x], if any"""
+        if (bitmap := self._bitmaps.get(key)) is None:
+            return None
+        bits = np.unpackbits(np.frombuffer(bitmap, np.uint8), bitorder="little")
+        return bits.reshape(self.chunk_size, self.chunk_size).view(bool)
+
+    def mask(self, x0: int, y0: int, x1: int, y1: int) -> NDArray:
+        """
+        Get the members inside a rectangle of the world in one pass
+
+        :param x0: first absolute x, inclusive
+        :param y0: first absolute y, inclusive
+        :param x1: last absolute x, exclusive
+        :param y1: last absolute y, exclusive
+        :return: bool array indexed [y - y0, x - x0]
+        """
+        out = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+        for key, dst, src in chunk_slices(x0, y0, x1, y1, self.chunk_size):
+            if (bits := self.chunk_mask(key)) is not None:
+                out[dst] = bits[src]
+        return out
+
+    @property
+    def nbytes(self) -> int:
+        """memory held by the bitmaps"""
+        return sum(len(bitmap) for bitmap in self._bitmaps.values())
@@ -0,0 +1,166 @@
+"""Cache generated world chunks"""
+
+import threading
+import typing
+from collections import OrderedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.config import CHUNK_CACHE_BYTES, CHUNK_SIZE
+from game.logger import logger
+from game.world.generate import generate_block
+
+if typing.TYPE_CHECKING:
+    from game.world.atlas import WorldAtlas
+
+logger = logger.getChild("world.chunks")
+
+
+def chunk_slices(x0: int, y0: int, x1: int, y1: int, size: int = CHUNK_SIZE):
+    """
+    Split a rectangle of the world along chunk borders
+
+    :return: yields the chunk key, the slices into the rectangle and the slices
+        into the chunk, both indexed [y, x]
+    """
+    for cy in range(y0 // size, (y1 - 1) // size + 1):
+        top, bottom = max(y0, cy * size), min(y1, (cy + 1) * size)
+        for cx in range(x0 // size, (x1 - 1) // size + 1):
+            left, right = max(x0, cx * size), min(x1, (cx + 1) * size)
+            yield (cx, cy), (
+                slice(top - y0, bottom - y0),
+                slice(left - x0, right - x0),
+            ), (
+                slice(top - cy * size, bottom - cy * size),
+                slice(left - cx * size, right - cx * size),
+            )
+
+
+class ChunkCache:
+    """Generates fixed size world chunks once and keeps them in an LRU cache"""
+
+    def __init__(
+        self,
+        seed: int,
+        chunk_size: int = CHUNK_SIZE,
+        max_bytes: int = CHUNK_CACHE_BYTES,
+        atlas: "WorldAtlas | None" = None,
+    ):
+        """
+        Initialize the cache
+
+        :param seed: world seed
+        :param chunk_size: tiles per side of a chunk
+        :param max_bytes: upper bound for the memory held by cached chunks
+        :param atlas: baked tiles to read from instead of generating them
+        """
+        self.seed = seed
+        self.atlas = atlas
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self._chunks: OrderedDict[tuple[int, int], NDArray] = OrderedDict()
+        self.nbytes = 0
+        # chunks may be generated by a prefetcher on another thread
+        self._lock = threading.Lock()
+        # prefetched chunks which were not requested yet
+        self._prefetched: set[tuple[int, int]] = set()
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return key in self._chunks
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def chunk_of(self, x: int, y: int) -> tuple[int, int]:
+        """get the key of the chunk containing an absolute position"""
+        return x // self.chunk_size, y // self.chunk_size
+
+    def _generate(self, key: tuple[int, int]) -> NDArray:
+        """generate the chunk with the given key"""
+        cx, cy = key
+        size = self.chunk_size
+        x, y = cx * size, cy * size
+        if self.atlas and self.atlas.covers(x, y, x + size, y + size):
+            # a view into the memory map, nothing is copied
+            return self.atlas.read(x, y, x + size, y + size)
+        return generate_block(self.seed, x, y, size, size)
+
+    def _store(self, key: tuple[int, int], chunk: NDArray) -> NDArray:
+        """cache a generated chunk, to be called with the lock held"""
+        if (cached := self._chunks.get(key)) is not None:
+            # generated concurrently by the prefetcher
+            return cached
+        chunk.setflags(write=False)
+        self._chunks[key] = chunk
+        self.nbytes += chunk.nbytes
+        # evict the least recently used chunks
+        while self.nbytes > self.max_bytes and len(self._chunks) > 1:
+            evicted_key, evicted = self._chunks.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self._prefetched.discard(evicted_key)
+        return chunk
+
+    def get(self, key: tuple[int, int]) -> NDArray:
+        """
+        Get a chunk, generating it if it is not cached
+
+        :param key: (cx, cy) chunk coordinates
+        :return: read-only array of tile ids indexed [y, x] within the chunk
+        """
+        with self._lock:
+            if (chunk := self._chunks.get(key)) is not None:
+                self.hits += 1
+                if key in self._prefetched:
+                    self.prefetch_hits += 1
+                    self._prefetched.discard(key)
+                self._chunks.move_to_end(key)
+                return chunk
+            self.misses += 1
+
+        chunk = self._generate(key)
+        with self._lock:
+            return self._store(key, chunk)
+
+    def prefetch(self, key: tuple[int, int]) -> None:
+        """generate a chunk ahead of time, without counting it as a hit or miss"""
+        with self._lock:
+            if key in self._chunks:
+                return
+        chunk = self._generate(key)
+        with self._lock:
+            if key not in self._chunks:
+                self._prefetched.add(key)
+            self._store(key, chunk)
+
+    def tile(self, x: int, y: int) -> int:
+        """get a single tile at an absolute position"""
+        chunk = self.get(self.chunk_of(x, y))
+        return int(chunk[y % self.chunk_size, x % self.chunk_size])
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> NDArray:
+        """
+        Assemble a rectangle of the world from the cached chunks
+
+        :param x0: first absolute x, inclusive
+        :param y0: first absolute y, inclusive
+        :param x1: last absolute x, exclusive
+        :param y1: last absolute y, exclusive
+        :return: uint8 array of tile ids indexed [y - y0, x - x0]
+        """
+        out = np.empty((y1 - y0, x1 - x0), dtype=np.uint8)
+        for key, dst, src in chunk_slices(x0, y0, x1, y1, self.chunk_size):
+            out[dst] = self.get(key)[src]
+        return out
+
+    def clear(self):
+        """drop all cached chunks"""
+        with self._lock:
+            self._chunks.clear()
+            self._prefetched.clear()
+            self.nbytes = 0
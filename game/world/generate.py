@@ -0,0 +1,148 @@
+"""Vectorized, hash based tile generation"""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from game.config import BIOME_SCALE
+from game.world.tiles import TILE_ENEMY, TILE_FLOOR, TILE_WALL
+
+# (tile, weight) out of 1000, the distribution of the plains
+SPAWN_TABLE = (
+    (TILE_FLOOR, 800),
+    (TILE_WALL, 185),
+    (TILE_ENEMY, 15),
+)
+
+
+class Biome(NamedTuple):
+    """A region of the world with its own spawn table"""
+
+    name: str
+    # the biome covers the biome noise below this bound
+    bound: float
+    # weights out of 1000 for each tile of SPAWN_TABLE
+    weights: tuple[int, int, int]
+
+
+# sorted by bound, the last one must cover the whole noise range
+BIOMES = (
+    Biome("ruins", 0.3, (640, 345, 15)),
+    Biome("plains", 0.72, (800, 185, 15)),
+    Biome("nest", 1.0, (850, 125, 25)),
+)
+# tile for every (biome, roll out of 1000), picking a tile is a single lookup
+_SPAWN_LUT = np.array(
+    [np.repeat([tile for tile, _ in SPAWN_TABLE], biome.weights) for biome in BIOMES],
+    dtype=np.uint8,
+)
+_BOUNDS = np.array([biome.bound for biome in BIOMES[:-1]])
+# decorrelates the biome noise from the tile rolls
+_BIOME_SALT = 0xB10E
+# how far hash bits dither the noise, roughens the biome borders
+_BIOME_JITTER = 0.06
+
+# large odd constants to spread the coordinates over 64 bits
+_PRIME_X = np.uint64(0x9E3779B97F4A7C15)
+_PRIME_Y = np.uint64(0xC2B2AE3D27D4EB4F)
+# murmur3 finalizer constants
+_FMIX_1 = np.uint64(0xFF51AFD7ED558CCD)
+_FMIX_2 = np.uint64(0xC4CEB9FE1A85EC53)
+_SHIFT = np.uint64(33)
+
+
+def tile_hash(seed: int, x: ArrayLike, y: ArrayLike) -> NDArray[np.uint64]:
+    """
+    Counter based hash of (seed, x, y), the same inputs always give the same output
+
+    :param seed: world seed
+    :param x: absolute x coordinates, broadcast against y
+    :param y: absolute y coordinates
+    :return: uint64 hashes with the broadcast shape of x and y
+    """
+    x = np.asarray(x).astype(np.uint64)
+    y = np.asarray(y).astype(np.uint64)
+    # the mixing wraps around on purpose, numpy only warns about it for scalars
+    with np.errstate(over="ignore"):
+        h = (x * _PRIME_X) ^ (y * _PRIME_Y) ^ np.uint64(seed & 0xFFFFFFFFFFFFFFFF)
+        h ^= h >> _SHIFT
+        h *= _FMIX_1
+        h ^= h >> _SHIFT
+        h *= _FMIX_2
+        h ^= h >> _SHIFT
+    return h
+
+
+def value_noise(
+    seed: int, x0: int, y0: int, width: int, height: int, scale: int
+) -> NDArray:
+    """
+    Smooth value noise over a block, interpolated from a hashed lattice
+
+    :param seed: noise seed
+    :param x0: absolute x of the first column
+    :param y0: absolute y of the first row
+    :param width: number of columns
+    :param height: number of rows
+    :param scale: distance in tiles between lattice points
+    :return: float array in [0, 1) indexed [y - y0, x - x0]
+    """
+    # hash only the lattice points around the block
+    gx, gy = x0 // scale, y0 // scale
+    lattice = tile_hash(
+        seed,
+        np.arange(gx, (x0 + width - 1) // scale + 2),
+        np.arange(gy, (y0 + height - 1) // scale + 2)[:, None],
+    ) >> np.uint64(11)
+    lattice = lattice * 2.0**-53
+
+    # positions in lattice units, split into cell and smoothstepped fraction
+    fx = np.arange(x0 - gx * scale, x0 - gx * scale + width) / scale
+    fy = np.arange(y0 - gy * scale, y0 - gy * scale + height) / scale
+    lx, ly = fx.astype(np.intp), fy.astype(np.intp)
+    fx -= lx
+    fy -= ly
+    fx = fx * fx * (3 - 2 * fx)
+    fy = (fy * fy * (3 - 2 * fy))[:, None]
+
+    # interpolate the few lattice rows first, then expand them along y
+    rows = lattice[:, lx] + (lattice[:, lx + 1] - lattice[:, lx]) * fx
+    return rows[ly] + (rows[ly + 1] - rows[ly]) * fy
+
+
+def _biomes(seed: int, x0: int, y0: int, hashes: NDArray) -> NDArray:
+    """get the biomes of a block from its tile hashes"""
+    height, width = hashes.shape
+    noise = value_noise(seed ^ _BIOME_SALT, x0, y0, width, height, BIOME_SCALE)
+    noise += (hashes >> np.uint64(56)) * (_BIOME_JITTER / 256)
+    return np.searchsorted(_BOUNDS, noise, side="right")
+
+
+def biome_field(seed: int, x0: int, y0: int, width: int, height: int) -> NDArray:
+    """
+    Get the biome of every tile of a block
+
+    :return: indices into BIOMES indexed [y - y0, x - x0]
+    """
+    xs = np.arange(x0, x0 + width, dtype=np.int64)
+    ys = np.arange(y0, y0 + height, dtype=np.int64)[:, None]
+    return _biomes(seed, x0, y0, tile_hash(seed, xs, ys))
+
+
+def generate_block(seed: int, x0: int, y0: int, width: int, height: int) -> NDArray:
+    """
+    Generate a block of tiles in one pass
+
+    :param seed: world seed
+    :param x0: absolute x of the first column
+    :param y0: absolute y of the first row
+    :param width: number of columns
+    :param height: number of rows
+    :return: uint8 array of tile ids indexed [y - y0, x - x0]
+    """
+    xs = np.arange(x0, x0 + width, dtype=np.int64)
+    ys = np.arange(y0, y0 + height, dtype=np.int64)[:, None]
+    hashes = tile_hash(seed, xs, ys)
+    rolls = hashes % np.uint64(1000)
+    return _SPAWN_LUT[_biomes(seed, x0, y0, hashes), rolls.astype(np.intp)]
@@ -0,0 +1,211 @@
+"""Shortest paths over the walkable tiles of the world"""
+
+import heapq
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.config import PATH_BUDGET, PATH_CACHE_SIZE, PATH_MARGIN
+from game.logger import logger
+
+logger = logger.getChild("world.pathfinding")
+
+# (x0, y0, x1, y1) -> bool array indexed [y - y0, x - x0], True where walkable
+Walkable = Callable[[int, int, int, int], NDArray]
+Path = list[tuple[int, int]]
+
+
+def search(  # pylint: disable=too-many-locals
+    walkable: NDArray, start: int, goals: NDArray, target: int | None, budget: int
+) -> tuple[list[int] | None, int]:
+    """
+    A* over a grid with 4 neighbours, a breadth first search without a target
+
+    :param walkable: bool grid of the tiles that can be walked through
+    :param start: flat index of the first tile
+    :param goals: bool grid of the tiles to reach, they don't have to be walkable
+    :param target: flat index of the only goal to guide the search, or None
+    :param budget: tiles visited at most
+    :return: flat indices of the path without the start, None if no goal was
+        reached within the budget, and the number of tiles visited
+    """
+    height, width = walkable.shape
+    # python lists index faster than arrays, one element at a time
+    walkable, goals = walkable.ravel().tolist(), goals.ravel().tolist()
+    ty, tx = divmod(target, width) if target is not None else (0, 0)
+
+    def heuristic(index: int) -> int:
+        if target is None:
+            return 0
+        y, x = divmod(index, width)
+        return abs(x - tx) + abs(y - ty)
+
+    came_from = {start: start}
+    cost = {start: 0}
+    queue = [(heuristic(start), 0, start)]
+    visited = 0
+    while queue and visited < budget:
+        _, steps, index = heapq.heappop(queue)
+        if steps > cost[index]:
+            continue
+        visited += 1
+        if goals[index]:
+            path = []
+            while index != start:
+                path.append(index)
+                index = came_from[index]
+            return path[::-1], visited
+        y, x = divmod(index, width)
+        for neighbour, inside in (
+            (index - 1, x > 0),
+            (index + 1, x < width - 1),
+            (index - width, y > 0),
+            (index + width, y < height - 1),
+        ):
+            if not inside or not (walkable[neighbour] or goals[neighbour]):
+                continue
+            if steps + 1 < cost.get(neighbour, steps + 2):
+                cost[neighbour] = steps + 1
+                came_from[neighbour] = index
+                heapq.heappush(
+                    queue, (steps + 1 + heuristic(neighbour), steps + 1, neighbour)
+                )
+    return None, visited
+
+
+class Pathfinder:
+    """Finds and caches paths, the cache is dropped whenever the world changes"""
+
+    def __init__(
+        self,
+        walkable: Walkable,
+        version: Callable[[], Hashable],
+        budget: int = PATH_BUDGET,
+        margin: int = PATH_MARGIN,
+        cache_size: int = PATH_CACHE_SIZE,
+    ):
+        """
+        Initialize the pathfinder
+
+        :param walkable: reads which tiles of a rectangle of the world are walkable
+        :param version: changes whenever the walkable tiles do
+        :param budget: tiles a single search visits at most, so no search stalls a
+            frame
+        :param margin: tiles around the start and the goals a path may detour through
+        :param cache_size: paths kept
+        """
+        self.walkable = walkable
+        self.version = version
+        self.budget = budget
+        self.margin = margin
+        self.cache_size = cache_size
+        # (start, goal) -> path, None if there was none within the budget
+        self._cache: OrderedDict[tuple, Path | None] = OrderedDict()
+        self._version = None
+
+        # accounting
+        self.hits = 0
+        self.misses = 0
+        self.visited = 0
+
+    def _sync(self):
+        """drop the cache if the world changed since it was filled"""
+        if (version := self.version()) != self._version:
+            self._cache.clear()
+            self._version = version
+
+    def _cached(self, key: tuple) -> tuple[bool, Path | None]:
+        """get a cached path, whether it was cached and the path"""
+        self._sync()
+        if key not in self._cache:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return True, self._cache[key]
+
+    def _store(self, key: tuple, path: Path | None):
+        """cache a path, evicting the least recently used"""
+        self._cache[key] = path
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _search(
+        self, start: tuple[int, int], goals: NDArray, target=None
+    ) -> Path | None:
+        """search within the margin around the start and the (gx, gy) goals"""
+        x0 = min(start[0], int(goals[:, 0].min())) - self.margin
+        y0 = min(start[1], int(goals[:, 1].min())) - self.margin
+        x1 = max(start[0], int(goals[:, 0].max())) + self.margin + 1
+        y1 = max(start[1], int(goals[:, 1].max())) + self.margin + 1
+        # the tiles are read once, in bulk
+        walkable = self.walkable(x0, y0, x1, y1)
+        goal_mask = np.zeros_like(walkable)
+        goal_mask[goals[:, 1] - y0, goals[:, 0] - x0] = True
+        width = x1 - x0
+
+        def flat(pos) -> int:
+            return int((pos[1] - y0) * width + pos[0] - x0)
+
+        path, visited = search(
+            walkable,
+            flat(start),
+            goal_mask,
+            None if target is None else flat(target),
+            self.budget,
+        )
+        self.visited += visited
+        if path is None:
+            logger.debug(f"no path from {start} within {visited} tiles")
+            return None
+        return [(x0 + index % width, y0 + index // width) for index in path]
+
+    def path(self, start: tuple[int, int], goal: tuple[int, int]) -> Path | None:
+        """
+        Find a shortest path
+
+        :param start: absolute position to start from
+        :param goal: absolute position to reach, the last step may be onto an
+            obstacle, like an enemy to fight
+        :return: the positions along the path, the start excluded, None if there is
+            none within the budget
+        """
+        key = (tuple(start), tuple(goal))
+        cached, path = self._cached(key)
+        if not cached:
+            path = (
+                []
+                if key[0] == key[1]
+                else self._search(start, np.array([goal]), target=goal)
+            )
+            self._store(key, path)
+        return None if path is None else list(path)
+
+    def nearest(self, start: tuple[int, int], goals: NDArray) -> Path | None:
+        """
+        Find a shortest path to the closest of a few goals
+
+        :param start: absolute position to start from
+        :param goals: (n, 2) array of the absolute positions to pick from, the last
+            step may be onto an obstacle
+        :return: the positions along the path, the start excluded, None if no goal
+            is reachable within the budget
+        """
+        if goals.size == 0:
+            return None
+        # search around the goals closest as the crow flies
+        distance = np.abs(goals - start).sum(axis=1)
+        goals = goals[distance <= distance.min() + self.margin]
+        self._sync()
+        path = self._search(start, goals)
+        if path:
+            # walking there again later is a cache hit
+            self._store((tuple(start), path[-1]), path)
+        return None if path is None else list(path)
+
+    def clear(self):
+        """drop the cached paths"""
+        self._cache.clear()
+        self._version = None
@@ -0,0 +1,97 @@
+"""Generate the world chunks ahead of the player in the background"""
+
+import queue
+import threading
+from collections import deque
+
+from game.config import PREFETCH_DISTANCE
+from game.logger import logger
+from game.world.chunks import ChunkCache, chunk_slices
+
+logger = logger.getChild("world.prefetch")
+
+
+class Prefetcher:
+    """Watches the movement direction and generates the chunks ahead on a thread"""
+
+    def __init__(
+        self,
+        chunks: ChunkCache,
+        distance: int = PREFETCH_DISTANCE,
+        history: int = 8,
+    ):
+        """
+        Initialize the prefetcher, the worker thread starts on the first move
+
+        :param chunks: the cache to fill
+        :param distance: how many tiles ahead of the viewport to keep resident
+        :param history: number of recent moves used to guess the direction
+        """
+        self.chunks = chunks
+        self.distance = distance
+        self._moves: deque[tuple[int, int]] = deque(maxlen=history)
+        self._queue: queue.SimpleQueue[tuple[int, int] | None] = queue.SimpleQueue()
+        self._queued: set[tuple[int, int]] = set()
+        self._thread: threading.Thread | None = None
+        # chunks the viewport reached before they were prefetched
+        self.misses = 0
+
+    @property
+    def hits(self) -> int:
+        """prefetched chunks that were used"""
+        return self.chunks.prefetch_hits
+
+    def _heading(self) -> tuple[int, int]:
+        """direction of the recent moves, the last move if they cancel out"""
+        sum_x = sum(move[0] for move in self._moves)
+        sum_y = sum(move[1] for move in self._moves)
+        if not sum_x and not sum_y:
+            return self._moves[-1]
+        return (sum_x > 0) - (sum_x < 0), (sum_y > 0) - (sum_y < 0)
+
+    def observe(self, view: tuple[int, int, int, int], dx: int, dy: int):
+        """
+        Called after every move, queue the chunks ahead of the view
+
+        :param view: absolute (x0, y0, x1, y1) of the viewport, x1 and y1 exclusive
+        :param dx: step along x
+        :param dy: step along y
+        """
+        self._moves.append((dx, dy))
+        x0, y0, x1, y1 = view
+        # the view is read right after, anything missing is generated while drawing
+        self.misses += sum(
+            key not in self.chunks
+            for key, _, _ in chunk_slices(*view, self.chunks.chunk_size)
+        )
+        hx, hy = self._heading()
+        ahead = (
+            x0 + min(0, hx * self.distance),
+            y0 + min(0, hy * self.distance),
+            x1 + max(0, hx * self.distance),
+            y1 + max(0, hy * self.distance),
+        )
+        for key, _, _ in chunk_slices(*ahead, self.chunks.chunk_size):
+            if key not in self.chunks and key not in self._queued:
+                self._queued.add(key)
+                self._queue.put(key)
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._work, name="chunk-prefetch", daemon=True
+            )
+            self._thread.start()
+
+    def _work(self):
+        """worker loop, generates queued chunks until stopped"""
+        while (key := self._queue.get()) is not None:
+            self.chunks.prefetch(key)
+            self._queued.discard(key)
+
+    def stop(self):
+        """stop the worker thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        logger.debug(f"prefetch hits: {self.hits}, misses: {self.misses}")
@@ -0,0 +1,412 @@
+"""Enemies that wander around their spawn and chase the player, as arrays"""
+
+import time
+from enum import IntEnum
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.config import (
+    ENEMY_CHASE_RADIUS,
+    ENEMY_CHASE_TIME,
+    ENEMY_LEASH,
+    ENEMY_WANDER_TIME,
+    ROAMING_RADIUS,
+)
+from game.logger import logger
+from game.world.bitset import ChunkBitset
+from game.world.chunks import ChunkCache
+from game.world.tiles import ENCOUNTER, TERRAIN_OF, TILE_FLOOR, WALKABLE
+
+logger = logger.getChild("world.roaming")
+
+# steps a wandering enemy picks from, standing still included
+_WANDER_STEPS = np.array([(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)])
+# no absolute (x, y) positions
+_NO_CELLS = np.empty((0, 2), dtype=np.int64)
+
+
+def _within(rect: tuple[int, int, int, int], x: NDArray, y: NDArray) -> NDArray:
+    """which absolute positions are inside a (x0, y0, x1, y1) rectangle"""
+    x0, y0, x1, y1 = rect
+    return (x0 <= x) & (x < x1) & (y0 <= y) & (y < y1)
+
+
+class Roam(IntEnum):
+    """What a roaming enemy is doing"""
+
+    WANDER = 0
+    CHASE = 1
+
+
+class RoamingEnemies:
+    """
+    The enemies of the chunks around the player, one entry per enemy in each array
+
+    The generated encounter tiles are where the enemies spawn, they roam while
+    their chunk is near the player and are back at their spawn once it isn't.
+    """
+
+    def __init__(
+        self,
+        chunks: ChunkCache,
+        seed: int,
+        radius: int = ROAMING_RADIUS,
+    ):
+        """
+        Initialize the enemies, they spawn once the player is followed
+
+        :param chunks: generated terrain, the spawns and the walls
+        :param seed: world seed, the enemies wander the same way every time
+        :param radius: chunks around the player's chunk where enemies roam
+        """
+        self.chunks = chunks
+        self.radius = radius
+        self._rng = np.random.default_rng(seed)
+
+        # absolute positions, spawns, tile ids, Roam states and seconds to the
+        # next step of each enemy
+        self.x = np.empty(0, dtype=np.int64)
+        self.y = np.empty(0, dtype=np.int64)
+        self.home_x = np.empty(0, dtype=np.int64)
+        self.home_y = np.empty(0, dtype=np.int64)
+        self.kind = np.empty(0, dtype=np.uint8)
+        self.state = np.empty(0, dtype=np.uint8)
+        self.timer = np.empty(0, dtype=np.float32)
+        # spawns of the roaming enemies, the generated tiles there aren't drawn
+        self.homes = ChunkBitset(chunk_size=chunks.chunk_size)
+        # absolute x, y and tile id of the spawns taken while another enemy stood
+        # on them, the enemy shows up once the tile is free
+        self._pending = np.empty((0, 3), dtype=np.int64)
+
+        # chunk of the player and the chunks around it
+        self._center: tuple[int, int] | None = None
+        self._active: set[tuple[int, int]] = set()
+        # absolute (x, y) of the first tile of the grids below
+        self._origin = (0, 0)
+        # the terrain enemies walk on, indexed [y, x] over the active chunks
+        self._walkable = np.zeros((0, 0), dtype=bool)
+        # spatial hash of the active chunks, the index of the enemy on each tile
+        # or -1
+        self._grid = np.zeros((0, 0), dtype=np.int32)
+        self._last_tick = time.monotonic()
+        # absolute position of an enemy that reached the player on the last update
+        self.attacker: tuple[int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def _cells(self, x: NDArray, y: NDArray) -> tuple[NDArray, NDArray]:
+        """grid indices of absolute positions"""
+        return y - self._origin[1], x - self._origin[0]
+
+    def _inside(self, x: NDArray, y: NDArray) -> NDArray:
+        """which absolute positions are on the grids"""
+        height, width = self._grid.shape
+        return _within(
+            (*self._origin, self._origin[0] + width, self._origin[1] + height), x, y
+        )
+
+    def at(self, x: int, y: int) -> int | None:
+        """index of the enemy at an absolute position, if any"""
+        if not self._inside(np.array(x), np.array(y)):
+            return None
+        index = int(self._grid[self._cells(x, y)])
+        return index if index >= 0 else None
+
+    def home(self, index: int) -> tuple[int, int]:
+        """where an enemy spawned"""
+        return int(self.home_x[index]), int(self.home_y[index])
+
+    def follow(self, pos: tuple[int, int], removed: ChunkBitset) -> None:
+        """
+        Keep the enemies of the chunks around the player roaming
+
+        :param pos: absolute position of the player
+        :param removed: removed positions of the level, these enemies don't spawn
+        """
+        size = self.chunks.chunk_size
+        center = (pos[0] // size, pos[1] // size)
+        if center == self._center:
+            return
+        self._center = center
+        cx, cy = center
+        r = self.radius
+        active = {
+            (x, y) for x in range(cx - r, cx + r + 1) for y in range(cy - r, cy + r + 1)
+        }
+        self._active = active
+
+        x0, y0 = (cx - r) * size, (cy - r) * size
+        x1, y1 = (cx + r + 1) * size, (cy + r + 1) * size
+        # enemies left behind are back at their spawn, spawned again below if
+        # it's still around the player
+        keep = _within((x0, y0, x1, y1), self.x, self.y) & _within(
+            (x0, y0, x1, y1), self.home_x, self.home_y
+        )
+        self._origin = (x0, y0)
+        self._drop_pending()
+        terrain = TERRAIN_OF[self.chunks.region(x0, y0, x1, y1)]
+        # removed walls are floor
+        terrain[removed.mask(x0, y0, x1, y1)] = TILE_FLOOR
+        self._walkable = WALKABLE[terrain]
+        self._grid = np.full(self._walkable.shape, -1, dtype=np.int32)
+        self._select(keep)
+        self.respawn(removed)
+        logger.debug(f"{len(self)} enemies roaming around chunk {center}")
+
+    def respawn(
+        self, removed: ChunkBitset, view: tuple[int, int, int, int] | None = None
+    ) -> None:
+        """
+        Spawn the enemies of the active chunks that aren't roaming or removed
+
+        :param removed: removed positions of the level, these enemies don't spawn
+        :param view: absolute (x0, y0, x1, y1) where nothing pops up, if any, the
+            enemies spawn there once it moved away
+        """
+        size = self.chunks.chunk_size
+        for key in sorted(self._active):
+            x0, y0 = key[0] * size, key[1] * size
+            block = self.chunks.get(key)
+            spawns = ENCOUNTER[block] & ~self.homes.mask(x0, y0, x0 + size, y0 + size)
+            if (bits := removed.chunk_mask(key)) is not None:
+                spawns &= ~bits
+            if not spawns.any():
+                continue
+            # taken at once, so the generated enemy isn't drawn while another
+            # enemy stands on the spawn
+            self.homes.add_mask(x0, y0, spawns)
+            ys, xs = np.nonzero(spawns)
+            self._pending = np.concatenate(
+                (self._pending, np.stack((xs + x0, ys + y0, block[ys, xs]), axis=1))
+            )
+        self._place(view)
+
+    def _place(self, view: tuple[int, int, int, int] | None = None) -> None:
+        """
+        Spawn the pending enemies whose spawn is free
+
+        :param view: absolute (x0, y0, x1, y1) where nothing pops up, if any
+        """
+        if not self._pending.size:
+            return
+        xs, ys, kinds = self._pending.T
+        free = self._grid[self._cells(xs, ys)] < 0
+        if view is not None:
+            free &= ~_within(view, xs, ys)
+        if free.any():
+            self._spawn(xs[free], ys[free], kinds[free])
+            self._pending = self._pending[~free]
+
+    def _drop_pending(self) -> None:
+        """forget the pending enemies, their spawns are free again"""
+        for home in self._pending[:, :2].tolist():
+            self.homes.discard(tuple(home))
+        self._pending = self._pending[:0]
+
+    def _spawn(self, xs: NDArray, ys: NDArray, kinds: NDArray) -> None:
+        """add enemies at their spawns"""
+        first = len(self)
+        self.x = np.concatenate((self.x, xs))
+        self.y = np.concatenate((self.y, ys))
+        self.home_x = np.concatenate((self.home_x, xs))
+        self.home_y = np.concatenate((self.home_y, ys))
+        self.kind = np.concatenate((self.kind, kinds.astype(np.uint8)))
+        self.state = np.concatenate(
+            (self.state, np.full(len(xs), Roam.WANDER, dtype=np.uint8))
+        )
+        # spread the first steps over a wander period
+        self.timer = np.concatenate(
+            (
+                self.timer,
+                self._rng.uniform(0, ENEMY_WANDER_TIME, len(xs)).astype(np.float32),
+            )
+        )
+        self._grid[self._cells(xs, ys)] = np.arange(first, len(self))
+
+    def _select(self, keep: NDArray) -> None:
+        """keep only some of the enemies and index them again"""
+        for home in zip(self.home_x[~keep].tolist(), self.home_y[~keep].tolist()):
+            self.homes.discard(home)
+        self.x, self.y = self.x[keep], self.y[keep]
+        self.home_x, self.home_y = self.home_x[keep], self.home_y[keep]
+        self.kind, self.state = self.kind[keep], self.state[keep]
+        self.timer = self.timer[keep]
+        self._grid.fill(-1)
+        self._grid[self._cells(self.x, self.y)] = np.arange(len(self))
+
+    def remove(self, indices: int | NDArray) -> None:
+        """remove defeated enemies, by index"""
+        keep = np.ones(len(self), dtype=bool)
+        keep[indices] = False
+        self._select(keep)
+
+    def remove_in(
+        self, x0: int, y0: int, mask: NDArray, lookup: NDArray
+    ) -> list[tuple[int, int]]:
+        """
+        Remove the enemies inside an area, the queued ones by their spawn
+
+        :param x0: absolute x of the first column
+        :param y0: absolute y of the first row
+        :param mask: bool array indexed [y - y0, x - x0], True for the affected tiles
+        :param lookup: bool per tile id, True for the kinds of enemies to remove
+        :return: absolute (x, y) spawns of the removed enemies
+        """
+        rect = (x0, y0, x0 + mask.shape[1], y0 + mask.shape[0])
+        inside = _within(rect, self.x, self.y)
+        inside[inside] = (
+            mask[self.y[inside] - y0, self.x[inside] - x0] & lookup[self.kind[inside]]
+        )
+        hit = np.flatnonzero(inside)
+        spawns = list(zip(self.home_x[hit].tolist(), self.home_y[hit].tolist()))
+        self.remove(hit)
+
+        xs, ys, kinds = self._pending.T
+        queued = _within(rect, xs, ys)
+        queued[queued] = mask[ys[queued] - y0, xs[queued] - x0] & lookup[kinds[queued]]
+        for home in self._pending[queued, :2].tolist():
+            self.homes.discard(tuple(home))
+            spawns.append(tuple(home))
+        self._pending = self._pending[~queued]
+        return spawns
+
+    def open_tiles(self, x0: int, y0: int, mask: NDArray) -> None:
+        """
+        Let the enemies walk onto tiles whose walls were removed
+
+        :param x0: absolute x of the first column
+        :param y0: absolute y of the first row
+        :param mask: bool array indexed [y - y0, x - x0], True for the opened tiles
+        """
+        ys, xs = np.nonzero(mask)
+        xs, ys = xs + x0, ys + y0
+        inside = self._inside(xs, ys)
+        self._walkable[self._cells(xs[inside], ys[inside])] = True
+
+    def update(
+        self, pos: tuple[int, int], view: tuple[int, int, int, int], chase=True
+    ) -> NDArray:
+        """
+        Called between frames, step the enemies whose timers ran out
+
+        :param pos: absolute position of the player
+        :param view: absolute (x0, y0, x1, y1) of the watched part of the world
+        :param chase: whether enemies close to the player chase it
+        :return: (n, 2) absolute (x, y) of the tiles inside the view that an enemy
+            left or stepped onto
+        """
+        now = time.monotonic()
+        self.timer -= now - self._last_tick
+        self._last_tick = now
+        self.attacker = None
+        self._place(view)
+        ready = np.flatnonzero(self.timer <= 0)
+        if not ready.size:
+            return _NO_CELLS
+
+        near, tx, ty = self._steps(ready, pos, chase)
+        on_player = (tx == pos[0]) & (ty == pos[1])
+        if (attackers := np.flatnonzero(near & on_player)).size:
+            self.attacker = (
+                int(self.x[ready[attackers[0]]]),
+                int(self.y[ready[attackers[0]]]),
+            )
+        index, old_x, old_y = self._move(ready, tx, ty, ~on_player)
+
+        self.state[ready] = np.where(near, Roam.CHASE, Roam.WANDER)
+        self.timer[ready] = np.where(
+            near,
+            ENEMY_CHASE_TIME,
+            self._rng.uniform(0.5, 1.5, ready.size) * ENEMY_WANDER_TIME,
+        )
+        cells = np.concatenate(
+            (
+                np.stack((old_x, old_y), axis=1),
+                np.stack((self.x[index], self.y[index]), axis=1),
+            )
+        )
+        return cells[_within(view, cells[:, 0], cells[:, 1])]
+
+    def _move(
+        self, ready: NDArray, tx: NDArray, ty: NDArray, allowed: NDArray
+    ) -> tuple[NDArray, NDArray, NDArray]:
+        """
+        Step some of the enemies onto free walkable tiles of the grid, one enemy per
+        tile
+
+        :param ready: indices of the enemies
+        :param tx: absolute x each of them steps to
+        :param ty: absolute y each of them steps to
+        :param allowed: which of them may step
+        :return: indices of the enemies that moved and where they were
+        """
+        moving = (
+            ((tx != self.x[ready]) | (ty != self.y[ready]))
+            & allowed
+            & self._inside(tx, ty)
+        )
+        cells = self._cells(tx[moving], ty[moving])
+        moving[moving] = self._walkable[cells] & (self._grid[cells] < 0)
+        rows, cols = self._cells(tx[moving], ty[moving])
+        _, first = np.unique(rows * self._grid.shape[1] + cols, return_index=True)
+        movers = np.flatnonzero(moving)[first]
+
+        index = ready[movers]
+        old_x, old_y = self.x[index], self.y[index]
+        self._grid[self._cells(old_x, old_y)] = -1
+        self.x[index], self.y[index] = tx[movers], ty[movers]
+        self._grid[self._cells(self.x[index], self.y[index])] = index
+        return index, old_x, old_y
+
+    def _steps(  # pylint: disable=too-many-locals
+        self, ready: NDArray, pos: tuple[int, int], chase: bool
+    ) -> tuple[NDArray, NDArray, NDArray]:
+        """
+        Pick where some of the enemies step to
+
+        :param ready: indices of the enemies
+        :param pos: absolute position of the player
+        :param chase: whether enemies close to the player chase it
+        :return: which enemies chase the player and the absolute x and y they step to
+        """
+        x, y = self.x[ready], self.y[ready]
+        dx, dy = pos[0] - x, pos[1] - y
+        near = chase & (np.abs(dx) + np.abs(dy) <= ENEMY_CHASE_RADIUS)
+        # wanderers back towards their spawn if they strayed too far
+        hx, hy = self.home_x[ready] - x, self.home_y[ready] - y
+        strayed = ~near & (np.abs(hx) + np.abs(hy) > ENEMY_LEASH)
+        dx, dy = np.where(strayed, hx, dx), np.where(strayed, hy, dy)
+        # close the longer gap first
+        across = np.abs(dx) >= np.abs(dy)
+        step_x = np.where(across, np.sign(dx), 0)
+        step_y = np.where(across, 0, np.sign(dy))
+        # the others pick a step at random
+        wander = _WANDER_STEPS[self._rng.integers(len(_WANDER_STEPS), size=ready.size)]
+        towards = near | strayed
+        step_x = np.where(towards, step_x, wander[:, 0])
+        step_y = np.where(towards, step_y, wander[:, 1])
+        return near, x + step_x, y + step_y
+
+    def paint(self, tiles: NDArray, x0: int, y0: int) -> None:
+        """
+        Draw the enemies onto a rectangle of the world
+
+        :param tiles: uint8 tile ids indexed [y - y0, x - x0], changed in place
+        :param x0: absolute x of the first column
+        :param y0: absolute y of the first row
+        """
+        height, width = tiles.shape
+        inside = _within((x0, y0, x0 + width, y0 + height), self.x, self.y)
+        tiles[self.y[inside] - y0, self.x[inside] - x0] = self.kind[inside]
+
+    def clear(self):
+        """forget every enemy, when a different level state is loaded"""
+        self._select(np.zeros(len(self), dtype=bool))
+        self._drop_pending()
+        self._center = None
+        self._active = set()
+        self._grid = np.zeros((0, 0), dtype=np.int32)
+        self._walkable = np.zeros((0, 0), dtype=bool)
+        self.attacker = None
@@ -0,0 +1,206 @@
+"""Tick the world chunks around the player in worker processes"""
+
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.config import (
+    CHUNK_SIZE,
+    ENEMY_RESPAWN_TIME,
+    SIMULATION_INTERVAL,
+    SIMULATION_RADIUS,
+    SIMULATION_WORKERS,
+)
+from game.logger import logger
+from game.world.bitset import ChunkBitset
+from game.world.generate import generate_block
+from game.world.tiles import TILE_ENEMY
+
+logger = logger.getChild("world.simulation")
+
+
+def tick_chunk(  # pylint: disable=too-many-locals
+    key: tuple[int, int],
+    seed: int,
+    chunk_size: int,
+    removed: NDArray | None,
+    timers: NDArray,
+    dt: float,
+    view: tuple[int, int, int, int],
+) -> tuple[tuple[int, int], NDArray, NDArray]:
+    """
+    Advance the timers of one chunk, runs in a worker process
+
+    :param key: chunk coordinates
+    :param seed: world seed
+    :param chunk_size: tiles per side of a chunk
+    :param removed: removed positions of the chunk as a bool array, if any
+    :param timers: seconds left until each removed enemy respawns, inf if none
+    :param dt: seconds since the last tick
+    :param view: absolute (x0, y0, x1, y1) of the viewport, nothing pops up inside it
+    :return: the key, the mask of respawned enemies and the new timers
+    """
+    cx, cy = key
+    x0, y0 = cx * chunk_size, cy * chunk_size
+    timers = timers - dt
+    due = timers <= 0
+    if removed is not None:
+        due &= removed
+    due &= generate_block(seed, x0, y0, chunk_size, chunk_size) == TILE_ENEMY
+
+    # enemies don't respawn in front of the player, they wait until off-screen
+    vx0, vy0, vx1, vy1 = view
+    xs = np.arange(x0, x0 + chunk_size)
+    ys = np.arange(y0, y0 + chunk_size)[:, None]
+    due &= ~((vx0 <= xs) & (xs < vx1) & (vy0 <= ys) & (ys < vy1))
+
+    timers[due] = np.inf
+    return key, due, timers
+
+
+class ChunkSimulation:
+    """Simulates the chunks near the player at a lower rate than the frame rate"""
+
+    def __init__(
+        self,
+        seed: int,
+        chunk_size: int = CHUNK_SIZE,
+        interval: float = SIMULATION_INTERVAL,
+        radius: int = SIMULATION_RADIUS,
+    ):
+        """
+        Initialize the simulation, the worker pool starts on the first tick
+
+        :param seed: world seed
+        :param chunk_size: tiles per side of a chunk
+        :param interval: seconds between ticks
+        :param radius: chunks around the player's chunk that are simulated
+        """
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.radius = radius
+        # seconds until removed enemies respawn, per chunk
+        self.timers: dict[tuple[int, int], NDArray] = {}
+        self._pool: ProcessPoolExecutor | None = None
+        self._futures: list[Future] = []
+        # timers as they were sent to the workers
+        self._sent: dict[tuple[int, int], NDArray] = {}
+        self._last_tick = time.monotonic()
+
+    def _chunk_timers(self, key: tuple[int, int]) -> NDArray:
+        """get the timers of a chunk, none of them running if it had none"""
+        if key not in self.timers:
+            size = self.chunk_size
+            self.timers[key] = np.full((size, size), np.inf, dtype=np.float32)
+        return self.timers[key]
+
+    def schedule_respawn(self, pos: tuple[int, int], delay=ENEMY_RESPAWN_TIME):
+        """respawn the enemy removed at an absolute position after `delay` seconds"""
+        x, y = pos
+        size = self.chunk_size
+        self._chunk_timers((x // size, y // size))[y % size, x % size] = delay
+
+    def schedule_removed(self, removed: ChunkBitset, delay=ENEMY_RESPAWN_TIME):
+        """
+        Respawn every removed enemy after `delay` seconds, the timers aren't saved
+        so they start over when a level state is loaded
+
+        :param removed: removed positions of the level, walls included
+        """
+        size = self.chunk_size
+        for key in removed.chunk_keys():
+            block = generate_block(self.seed, key[0] * size, key[1] * size, size, size)
+            enemies = removed.chunk_mask(key) & (block == TILE_ENEMY)
+            if enemies.any():
+                self._chunk_timers(key)[enemies] = delay
+
+    def update(
+        self, removed: ChunkBitset, center: tuple[int, int], view: tuple
+    ) -> bool:
+        """
+        Called between frames, merge finished ticks and start the next one
+
+        :param removed: removed positions of the level, respawns are merged into it
+        :param center: absolute position of the player
+        :param view: absolute (x0, y0, x1, y1) of the viewport
+        :return: True if any enemy respawned
+        """
+        if self._futures:
+            if not all(future.done() for future in self._futures):
+                return False
+            return self._merge(removed)
+
+        now = time.monotonic()
+        if now - self._last_tick < self.interval:
+            return False
+        dt, self._last_tick = now - self._last_tick, now
+
+        cx, cy = center[0] // self.chunk_size, center[1] // self.chunk_size
+        active = [
+            key
+            for key in self.timers
+            if abs(key[0] - cx) <= self.radius and abs(key[1] - cy) <= self.radius
+        ]
+        if not active:
+            return False
+        if self._pool is None:
+            # forking would copy the locks held by the prefetch thread, so the
+            # workers start from a fresh interpreter
+            self._pool = ProcessPoolExecutor(
+                SIMULATION_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        for key in active:
+            self._sent[key] = self.timers[key].copy()
+            self._futures.append(
+                self._pool.submit(
+                    tick_chunk,
+                    key,
+                    self.seed,
+                    self.chunk_size,
+                    removed.chunk_mask(key),
+                    self._sent[key],
+                    dt,
+                    view,
+                )
+            )
+        return False
+
+    def _merge(self, removed: ChunkBitset) -> bool:
+        """merge the results of the workers into the level state"""
+        respawned = 0
+        for future in self._futures:
+            (cx, cy), due, timers = future.result()
+            key = (cx, cy)
+            sent = self._sent.pop(key)
+            current = self.timers.get(key)
+            if current is None:
+                # cleared while the workers were busy
+                continue
+            # keep respawns scheduled while the workers were busy
+            self.timers[key] = np.where(current == sent, timers, current)
+            if np.isinf(self.timers[key]).all():
+                del self.timers[key]
+            for y, x in zip(*(axis.tolist() for axis in np.nonzero(due))):
+                removed.discard((cx * self.chunk_size + x, cy * self.chunk_size + y))
+                respawned += 1
+        self._futures.clear()
+        if respawned:
+            logger.debug(f"{respawned} enemies respawned")
+        return bool(respawned)
+
+    def clear(self):
+        """forget all timers, when a different level state is loaded"""
+        self.timers.clear()
+        self._sent.clear()
+        self._futures.clear()
+
+    def close(self):
+        """forget all timers and shut the worker pool down, it restarts on demand"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.clear()
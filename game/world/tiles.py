@@ -0,0 +1,112 @@
+"""Registry of the tile types, tiles are stored as compact uint8 ids"""
+
+from enum import IntEnum
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from game.config import TILE_SIZE
+
+
+class Layer(IntEnum):
+    """Layers of a tile array, the first axis of Level.tiles"""
+
+    TERRAIN = 0
+    OBJECT = 1
+
+
+class TileType(NamedTuple):
+    """A kind of tile and how the game treats it"""
+
+    name: str
+    layer: Layer
+    # image and the size the map draws it at, None if the map doesn't draw it
+    sprite: tuple[str, tuple[int, int]] | None = None
+    # the player can step onto it
+    walkable: bool = False
+    # stepping onto it starts a battle
+    encounter: bool = False
+    # colour of the tile when the map is zoomed out too far for sprites
+    color: tuple[int, int, int] = (0, 0, 0)
+
+
+# every tile type, indexed by id, see register_tile
+TILE_TYPES: list[TileType] = [
+    # an empty cell of the object layer
+    TileType("none", Layer.OBJECT, walkable=True),
+    TileType("floor", Layer.TERRAIN, walkable=True, color=(40, 40, 40)),
+]
+TILE_NONE = 0
+TILE_FLOOR = 1
+
+# lookup tables indexed by tile id, filled in place as types are registered
+WALKABLE = np.zeros(256, dtype=bool)
+ENCOUNTER = np.zeros(256, dtype=bool)
+DRAWN = np.zeros(256, dtype=bool)
+COLORS = np.zeros((256, 3), dtype=np.uint8)
+# the terrain and the object of a generated tile, see split_layers
+TERRAIN_OF = np.zeros(256, dtype=np.uint8)
+OBJECT_OF = np.zeros(256, dtype=np.uint8)
+
+
+def _index(tile_id: int):
+    """fill the lookup tables for a tile type"""
+    tile = TILE_TYPES[tile_id]
+    WALKABLE[tile_id] = tile.walkable
+    ENCOUNTER[tile_id] = tile.encounter
+    DRAWN[tile_id] = tile.sprite is not None
+    COLORS[tile_id] = tile.color
+    # objects stand on the floor, terrain has nothing on top
+    terrain = tile.layer is Layer.TERRAIN
+    TERRAIN_OF[tile_id] = tile_id if terrain else TILE_FLOOR
+    OBJECT_OF[tile_id] = TILE_NONE if terrain else tile_id
+
+
+def register_tile(tile: TileType) -> int:
+    """
+    Register a tile type, the lookup tables pick it up without any other changes
+
+    :param tile: the tile type
+    :return: its id
+    """
+    if len(TILE_TYPES) > np.iinfo(np.uint8).max:
+        raise ValueError(f"{tile.name}: too many tile types")
+    if tile.name in (t.name for t in TILE_TYPES):
+        raise ValueError(f"{tile.name}: Name already in use")
+    TILE_TYPES.append(tile)
+    _index(len(TILE_TYPES) - 1)
+    return len(TILE_TYPES) - 1
+
+
+def split_layers(tiles: NDArray) -> NDArray:
+    """
+    Split generated tiles into their layers
+
+    :param tiles: uint8 tile ids, as generated
+    :return: uint8 array with a leading Layer axis
+    """
+    return np.stack((TERRAIN_OF[tiles], OBJECT_OF[tiles]))
+
+
+_index(TILE_NONE)
+_index(TILE_FLOOR)
+TILE_WALL = register_tile(
+    TileType(
+        "wall",
+        Layer.TERRAIN,
+        sprite=("assets/wall.png", (TILE_SIZE, TILE_SIZE)),
+        color=(110, 110, 110),
+    )
+)
+TILE_ENEMY = register_tile(
+    TileType(
+        "enemy",
+        Layer.OBJECT,
+        sprite=("assets/enemy.png", (64, 64)),
+        encounter=True,
+        color=(90, 210, 160),
+    )
+)
+# drawn by the map view itself
+TILE_PLAYER = register_tile(TileType("player", Layer.OBJECT, color=(255, 255, 255)))
@@ -0,0 +1,28 @@
+"""Tests for the baked world atlas"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from game.world.atlas import WorldAtlas, bake_atlas
+
+
+class WorldAtlasTest(unittest.TestCase):
+    """an atlas is only used with the generator it was baked by"""
+
+    def test_rejects_other_generator(self):
+        """an atlas baked by another generator doesn't match"""
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "atlas.npy"
+            bake_atlas(path, 42, -8, -8, 8, 8)
+            self.assertTrue(WorldAtlas(path).matches())
+            meta_path = path.with_suffix(".json")
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            meta["generator"] = "0" * 40
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+            self.assertFalse(WorldAtlas(path).matches())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+"""Tests for the tile generation"""
+
+import unittest
+import warnings
+
+import numpy as np
+
+from game.world.generate import tile_hash
+
+
+class TileHashTest(unittest.TestCase):
+    """tile_hash gives the same hashes however it is called"""
+
+    def test_scalar_matches_array(self):
+        """a scalar call doesn't warn about the wrapping and matches the array call"""
+        xs = np.array([0, 1, -7, 123456, -(2**40)])
+        ys = np.array([0, -1, 3, -654321, 2**40])
+        expected = tile_hash(42, xs, ys)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for x, y, h in zip(xs.tolist(), ys.tolist(), expected.tolist()):
+                self.assertEqual(int(tile_hash(42, x, y)), h)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+"""Tests for the chunk simulation"""
+
+import unittest
+
+import numpy as np
+
+from game.world.bitset import ChunkBitset
+from game.world.generate import generate_block
+from game.world.simulation import ChunkSimulation
+from game.world.tiles import TILE_ENEMY, TILE_WALL
+
+
+class ScheduleRemovedTest(unittest.TestCase):
+    """removed enemies respawn again after a level state is loaded"""
+
+    def test_only_enemies(self):
+        """the removed enemies get a timer, the removed walls don't"""
+        simulation = ChunkSimulation(42, chunk_size=32)
+        block = generate_block(42, 0, 0, 32, 32)
+        enemy = tuple(np.argwhere(block == TILE_ENEMY)[0][::-1].tolist())
+        wall = tuple(np.argwhere(block == TILE_WALL)[0][::-1].tolist())
+        simulation.schedule_removed(ChunkBitset([enemy, wall], chunk_size=32), 5)
+        timers = simulation.timers[(0, 0)]
+        self.assertEqual(timers[enemy[1], enemy[0]], 5)
+        self.assertTrue(np.isinf(timers[wall[1], wall[0]]))
+        self.assertEqual(np.count_nonzero(np.isfinite(timers)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()